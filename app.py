@@ -26,7 +26,10 @@ socketio = SocketIO(
     cors_allowed_origins="*",
     logger=True,
     engineio_logger=True,
-    async_mode='threading'
+    # threading by default; SOCKETIO_ASYNC_MODE=gevent or eventlet switches to
+    # greenlets. Start through run_websocket.py, which monkey-patches the
+    # stdlib for either library before this module is imported
+    async_mode=os.environ.get('SOCKETIO_ASYNC_MODE', 'threading')
 )
 
 # Configuration
@@ -178,8 +181,8 @@ def handle_disconnect():
     logger.info('Client disconnected from WebSocket')
 
 @socketio.on('request_data')
-def handle_data_request():
-    """Handle client request for current data"""
+def handle_data_request(options=None):
+    """Handle client request for current data (options are not used here)"""
     try:
         # Send any cached data if available
         if hasattr(data_processor, 'last_processed_data') and data_processor.last_processed_data is not None:
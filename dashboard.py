@@ -9,6 +9,7 @@ import socketio
 import threading
 import time
 import json
+import zlib
 import logging
 from config import Config
 
@@ -21,6 +22,11 @@ class DashboardApp:
         """Initialize the Dashboard application"""
         self.config = Config()
         self.cached_data = pd.DataFrame()
+        self.data_seq = None
+        # One snapshot request in flight at a time; deltas that arrive
+        # meanwhile are held and replayed on top of it
+        self.awaiting_snapshot = False
+        self.pending_deltas = []
         self.kpi_config = self.config.get_kpi_config()
         
         # Initialize Dash app
@@ -46,7 +52,9 @@ class DashboardApp:
         @self.sio.event
         def connect():
             logger.info('Connected to WebSocket server')
-            self.sio.emit('request_data')  # Request current data on connect
+            # A request sent before a reconnect may never be answered
+            self.awaiting_snapshot = False
+            self.request_snapshot()  # Request current data on connect
         
         @self.sio.event
         def disconnect():
@@ -58,13 +66,63 @@ class DashboardApp:
         
         @self.sio.on('new_data')
         def on_new_data(data):
+            self.apply_snapshot(data)
+        
+        @self.sio.on('snapshot_gz')
+        def on_snapshot_gz(blob):
             try:
-                new_data = pd.DataFrame(data['data'])
-                if not new_data.empty:
-                    self.cached_data = new_data
-                    logger.info(f"Received {len(new_data)} records from WebSocket")
+                self.apply_snapshot(json.loads(zlib.decompress(blob)))
             except Exception as e:
-                logger.error(f"Error processing WebSocket data: {str(e)}")
+                logger.error(f"Error decoding compressed snapshot: {str(e)}")
+        
+        @self.sio.on('data_delta')
+        def on_data_delta(data):
+            if self.awaiting_snapshot:
+                self.pending_deltas.append(data)
+                return
+            self.apply_delta(data)
+    
+    def request_snapshot(self):
+        """Ask the server for the full window, compressed where it supports that"""
+        if self.awaiting_snapshot:
+            return
+        self.awaiting_snapshot = True
+        self.sio.emit('request_data', {'compressed': True})
+    
+    def apply_snapshot(self, data):
+        """Replace the cached frame with a full snapshot from the server"""
+        self.awaiting_snapshot = False
+        pending, self.pending_deltas = self.pending_deltas, []
+        try:
+            new_data = pd.DataFrame(data['data'])
+            self.data_seq = data.get('seq')
+            self.cached_data = new_data
+            if not new_data.empty:
+                logger.info(f"Received {len(new_data)} records from WebSocket")
+        except Exception as e:
+            logger.error(f"Error processing WebSocket data: {str(e)}")
+            return
+        # Deltas the snapshot already covers are skipped by their seq
+        for delta in pending:
+            self.apply_delta(delta)
+    
+    def apply_delta(self, data):
+        """Append a delta's rows, or resync when it does not follow data_seq"""
+        try:
+            count = data['count']
+            if self.data_seq is not None and data['seq'] <= self.data_seq:
+                return  # already covered by the last snapshot
+            # A gap in the sequence means deltas were missed; resync
+            if self.data_seq is None or data['seq'] - count != self.data_seq:
+                self.request_snapshot()
+                return
+            self.data_seq = data['seq']
+            # Deltas are column-oriented: one value list per column name
+            rows = pd.DataFrame(dict(zip(data['columns'], data['data'])))
+            combined = pd.concat([self.cached_data, rows], ignore_index=True)
+            self.cached_data = combined.tail(1000).reset_index(drop=True)
+        except Exception as e:
+            logger.error(f"Error processing WebSocket delta: {str(e)}")
     
     def start_websocket_client(self):
         """Start WebSocket client in background thread"""
@@ -5,139 +5,428 @@ Beautiful visualizations with interactive charts and animated KPIs
 """
 
 import os
+import sys
+import io
+import gzip
+import hashlib
+import shutil
 import json
 import time
 import threading
+import uuid
+import functools
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from flask import Flask, render_template, request, jsonify
+from concurrent.futures import ThreadPoolExecutor
+from flask import Flask, Response, render_template, request
 from werkzeug.utils import secure_filename
+from json_codec import dumps_json
+from upload_io import UploadJobs, copy_to_fd, fadvise, save_upload_stream
 
 # Create Flask app
 app = Flask(__name__)
 app.secret_key = "enhanced-dashboard-secret-key"
 
-# Global data storage
-current_data = []
+# Global data storage: fixed-capacity ring of the most recent records.
+# records_written is the monotonic write cursor; the next slot is
+# records_written % MAX_RECORDS.
+# Slots hold plain dicts because uploads carry arbitrary schemas, so numeric
+# fields are Python floats (always 8-byte doubles). Narrowing generated
+# columns to float32 would not shrink them and would leak representation
+# noise (207.51 -> 207.50999450683594) into /api/data.
+MAX_RECORDS = 1000
+ring = [None] * MAX_RECORDS
+records_written = 0
 data_lock = threading.Lock()
 
+# Bumped on every write; /api/data responses are memoized per version.
+# data_updated_at is stamped by writers, so readers never touch the clock.
+data_version = 0
+data_updated_at = time.time()
+data_cache = (None, b'')
+
+# Wakes /api/stream listeners when the version changes
+data_changed = threading.Condition(data_lock)
+STREAM_KEEPALIVE = 15
+# Each open stream holds a server thread, so only this many run at once;
+# clients turned away fall back to polling /api/data
+MAX_STREAMS = int(os.getenv('MAX_STREAMS', '4'))
+STREAM_RETRY_AFTER = 30
+stream_slots = threading.BoundedSemaphore(MAX_STREAMS)
+
 # Configuration
 UPLOAD_FOLDER = 'uploads'
-ALLOWED_EXTENSIONS = {'json', 'csv'}
+ALLOWED_EXTENSIONS = frozenset({'json', 'csv'})
+
+# Low-cardinality string columns share one label object per distinct value
+CATEGORICAL_FIELDS = ('category', 'region', 'status', 'priority')
+MAX_CATEGORY_LABELS = 256
+category_labels = {field: {} for field in CATEGORICAL_FIELDS}
+
+# Background simulator: one record per tick, drawn in vectorized batches
+SIMULATION_INTERVAL = 15
+SIMULATION_BATCH = 64
+simulation_rng = np.random.default_rng()
+simulation_thread = None
+simulation_lock = threading.Lock()
+# Set by user activity to cut short the simulator's error backoff
+simulation_wake = threading.Event()
+SIMULATION_MAX_BACKOFF = 60
+
+# Uploaded files are parsed off the request thread
+PARSE_POOL = ThreadPoolExecutor(max_workers=os.cpu_count() or 4, thread_name_prefix='upload-parse')
+upload_jobs = UploadJobs()
+
+# Uploads below this size are parsed from memory instead of uploads/
+IN_MEMORY_UPLOAD_LIMIT = 50 * 1024 * 1024
+app.config['MAX_CONTENT_LENGTH'] = 512 * 1024 * 1024
+
+# Resumable uploads: chunks and a manifest live in uploads/chunks/<upload_id>/
+CHUNK_FOLDER = os.path.join(UPLOAD_FOLDER, 'chunks')
+MAX_UPLOAD_CHUNKS = 4096
+# The client sends 8 MiB chunks; the whole file is held to the plain upload limit
+MAX_CHUNK_SIZE = 16 * 1024 * 1024
+MAX_CHUNKED_UPLOAD_SIZE = app.config['MAX_CONTENT_LENGTH']
+# Chunk directories untouched for this long are treated as abandoned
+CHUNK_UPLOAD_TTL = 3600
+chunk_lock = threading.Lock()
+
+# Response compression (JSON payloads compress ~8-10x)
+COMPRESS_MIMETYPES = {'application/json', 'text/html'}
+COMPRESS_MIN_SIZE = 1024
+COMPRESS_LEVEL = 4
 
 # Ensure directories exist
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 
+@functools.lru_cache(maxsize=1024)
 def allowed_file(filename):
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    dot = filename.rfind('.')
+    return dot >= 0 and filename[dot + 1:].lower() in ALLOWED_EXTENSIONS
+
+def json_response(payload, status=200):
+    """Serialize a payload with orjson into a JSON response"""
+    return Response(dumps_json(payload), status=status, mimetype='application/json')
+
+@app.after_request
+def compress_response(response):
+    """Gzip JSON/HTML responses for clients that accept it"""
+    accept_encoding = request.headers.get('Accept-Encoding', '').lower()
+    if (response.status_code != 200
+            or response.is_streamed
+            or response.direct_passthrough
+            or response.mimetype not in COMPRESS_MIMETYPES
+            or 'Content-Encoding' in response.headers
+            or 'gzip' not in accept_encoding):
+        return response
+    
+    body = response.get_data()
+    if len(body) < COMPRESS_MIN_SIZE:
+        return response
+    
+    response.set_data(gzip.compress(body, COMPRESS_LEVEL))
+    response.headers['Content-Encoding'] = 'gzip'
+    response.vary.add('Accept-Encoding')
+    return response
+
+def choose(rng, options, size):
+    """Pick size labels at random; rows share the option strings"""
+    return np.array(options, dtype=object)[rng.integers(0, len(options), size)].tolist()
 
 def create_enhanced_sample_data():
     """Generate rich sample data with multiple metrics for enhanced visualizations"""
-    np.random.seed(42)
+    rng = np.random.default_rng(42)
     
     categories = ['Electronics', 'Clothing', 'Books', 'Home & Garden', 'Sports', 'Automotive', 'Health', 'Beauty']
     regions = ['North America', 'Europe', 'Asia Pacific', 'Latin America']
     statuses = ['Active', 'Pending', 'Completed', 'Cancelled']
     priorities = ['High', 'Medium', 'Low']
     
-    # Generate data for the last 30 days
-    base_date = datetime.now() - timedelta(days=30)
+    num_records = 200  # More data points for better charts
     
-    data = []
-    for i in range(200):  # More data points for better charts
-        date = base_date + timedelta(days=np.random.randint(0, 30), 
-                                   hours=np.random.randint(0, 24),
-                                   minutes=np.random.randint(0, 60))
-        
-        record = {
-            'id': i + 1,
-            'timestamp': date.isoformat(),
-            'date': date.strftime('%Y-%m-%d'),
-            'month': date.strftime('%B'),
-            'day_of_week': date.strftime('%A'),
-            'hour': date.hour,
-            
-            # Financial metrics
-            'revenue': round(np.random.lognormal(6, 0.5), 2),
-            'cost': round(np.random.lognormal(5, 0.4), 2),
-            'profit_margin': round(np.random.uniform(10, 40), 1),
-            
-            # Performance metrics
-            'conversion_rate': round(np.random.uniform(1, 15), 2),
-            'customer_satisfaction': round(np.random.uniform(3.0, 5.0), 1),
-            'response_time': round(np.random.exponential(200), 0),
-            
-            # Business metrics
-            'units_sold': np.random.randint(1, 100),
-            'page_views': np.random.randint(100, 10000),
-            'bounce_rate': round(np.random.uniform(20, 80), 1),
-            
-            # Categorical data
-            'category': np.random.choice(categories),
-            'region': np.random.choice(regions),
-            'status': np.random.choice(statuses),
-            'priority': np.random.choice(priorities),
-            
-            # Customer data
-            'customer_type': np.random.choice(['New', 'Returning', 'VIP']),
-            'acquisition_channel': np.random.choice(['Organic', 'Paid Search', 'Social Media', 'Email', 'Direct']),
-            
-            # Additional metrics
-            'rating': round(np.random.uniform(1, 5), 1),
-            'inventory_level': np.random.randint(0, 1000),
-            'temperature': round(np.random.normal(22, 5), 1),  # For IoT-style data
-        }
-        
-        # Calculate derived metrics
-        record['profit'] = round(record['revenue'] - record['cost'], 2)
-        record['roi'] = round((record['profit'] / record['cost']) * 100, 1) if record['cost'] > 0 else 0
-        
-        data.append(record)
+    # Generate timestamps for the last 30 days in one vectorized pass
+    base_date = np.datetime64(datetime.now() - timedelta(days=30), 'us')
+    minute_offsets = (rng.integers(0, 30, num_records) * 24 * 60
+                      + rng.integers(0, 24, num_records) * 60
+                      + rng.integers(0, 60, num_records))
+    timestamps = base_date + minute_offsets.astype('timedelta64[m]')
+    date_index = pd.DatetimeIndex(timestamps)
     
-    return data
+    iso_timestamps = np.datetime_as_string(timestamps).tolist()
+    dates = date_index.strftime('%Y-%m-%d').tolist()
+    months = date_index.month_name().tolist()
+    days_of_week = date_index.day_name().tolist()
+    hours = date_index.hour.tolist()
+    
+    # Financial metrics
+    revenue = np.round(rng.lognormal(6, 0.5, num_records), 2)
+    cost = np.round(rng.lognormal(5, 0.4, num_records), 2)
+    
+    # Calculate derived metrics without per-row branches
+    profit = np.round(revenue - cost, 2)
+    roi = np.round(np.divide(profit * 100, cost, out=np.zeros_like(profit), where=cost > 0), 1)
+    
+    columns = {
+        'id': np.arange(1, num_records + 1).tolist(),
+        'timestamp': iso_timestamps,
+        'date': dates,
+        'month': months,
+        'day_of_week': days_of_week,
+        'hour': hours,
+        
+        # Financial metrics
+        'revenue': revenue.tolist(),
+        'cost': cost.tolist(),
+        'profit_margin': np.round(rng.uniform(10, 40, num_records), 1).tolist(),
+        
+        # Performance metrics
+        'conversion_rate': np.round(rng.uniform(1, 15, num_records), 2).tolist(),
+        'customer_satisfaction': np.round(rng.uniform(3.0, 5.0, num_records), 1).tolist(),
+        'response_time': np.round(rng.exponential(200, num_records), 0).tolist(),
+        
+        # Business metrics
+        'units_sold': rng.integers(1, 100, num_records).tolist(),
+        'page_views': rng.integers(100, 10000, num_records).tolist(),
+        'bounce_rate': np.round(rng.uniform(20, 80, num_records), 1).tolist(),
+        
+        # Categorical data
+        'category': choose(rng, categories, num_records),
+        'region': choose(rng, regions, num_records),
+        'status': choose(rng, statuses, num_records),
+        'priority': choose(rng, priorities, num_records),
+        
+        # Customer data
+        'customer_type': choose(rng, ['New', 'Returning', 'VIP'], num_records),
+        'acquisition_channel': choose(rng, ['Organic', 'Paid Search', 'Social Media', 'Email', 'Direct'], num_records),
+        
+        # Additional metrics
+        'rating': np.round(rng.uniform(1, 5, num_records), 1).tolist(),
+        'inventory_level': rng.integers(0, 1000, num_records).tolist(),
+        'temperature': np.round(rng.normal(22, 5, num_records), 1).tolist(),  # For IoT-style data
+        
+        'profit': profit.tolist(),
+        'roi': roi.tolist(),
+    }
+    
+    names = list(columns)
+    return [dict(zip(names, row)) for row in zip(*columns.values())]
+
+def generate_simulated_batch(size=SIMULATION_BATCH):
+    """Draw the metric fields for a batch of simulated records"""
+    rng = simulation_rng
+    revenue = rng.lognormal(6, 0.5, size)
+    cost = rng.lognormal(5, 0.4, size)
+    conversion_rate = rng.uniform(1, 15, size)
+    satisfaction = rng.uniform(3.0, 5.0, size)
+    
+    # Round every column in place rather than allocating rounded copies
+    np.round(revenue, 2, out=revenue)
+    np.round(cost, 2, out=cost)
+    np.round(conversion_rate, 2, out=conversion_rate)
+    np.round(satisfaction, 1, out=satisfaction)
+    
+    # Calculate derived metrics
+    profit = np.subtract(revenue, cost)
+    np.round(profit, 2, out=profit)
+    
+    columns = {
+        'revenue': revenue.tolist(),
+        'cost': cost.tolist(),
+        'category': choose(rng, ['Electronics', 'Clothing', 'Books'], size),
+        'region': choose(rng, ['North America', 'Europe', 'Asia Pacific'], size),
+        'status': choose(rng, ['Active', 'Pending', 'Completed'], size),
+        'conversion_rate': conversion_rate.tolist(),
+        'customer_satisfaction': satisfaction.tolist(),
+        'units_sold': rng.integers(1, 50, size).tolist(),
+        'priority': choose(rng, ['High', 'Medium', 'Low'], size),
+        'profit': profit.tolist(),
+    }
+    
+    names = list(columns)
+    return [dict(zip(names, row)) for row in zip(*columns.values())]
+
+def intern_categories(records):
+    """Replace categorical values with their canonical shared label"""
+    for record in records:
+        if not isinstance(record, dict):
+            continue
+        for field in CATEGORICAL_FIELDS:
+            value = record.get(field)
+            if not isinstance(value, str):
+                continue
+            labels = category_labels[field]
+            label = labels.get(value)
+            if label is None:
+                if len(labels) >= MAX_CATEGORY_LABELS:
+                    continue
+                # Interned, so parsed uploads and the simulator's batches share it
+                label = labels[value] = sys.intern(value)
+            record[field] = label
 
 def add_data_to_stream(new_data):
     """Add data to global stream"""
-    global current_data
+    global records_written, data_version, data_updated_at
+    records = new_data if isinstance(new_data, list) else [new_data]
+    intern_categories(records)
+    
+    # Only the newest MAX_RECORDS of an oversized batch can survive
+    kept = records[-MAX_RECORDS:]
     with data_lock:
-        if isinstance(new_data, list):
-            current_data.extend(new_data)
-        else:
-            current_data.append(new_data)
+        start = (records_written + len(records) - len(kept)) % MAX_RECORDS
+        first = min(len(kept), MAX_RECORDS - start)
+        ring[start:start + first] = kept[:first]
+        ring[:len(kept) - first] = kept[first:]
+        records_written += len(records)
         
-        # Keep only last 1000 records
-        if len(current_data) > 1000:
-            current_data = current_data[-1000:]
+        data_version += 1
+        data_updated_at = time.time()
+        data_changed.notify_all()
+
+def records_since(cursor):
+    """Return records written after cursor oldest first (caller holds data_lock)"""
+    start = cursor % MAX_RECORDS
+    end = start + (records_written - cursor)
+    if end <= MAX_RECORDS:
+        return ring[start:end]
+    return ring[start:] + ring[:end - MAX_RECORDS]
+
+def snapshot_records():
+    """Return the buffered records oldest first (caller holds data_lock)"""
+    return records_since(max(0, records_written - MAX_RECORDS))
+
+def parse_records(stream, file_ext):
+    """Parse JSON or CSV records from a binary stream"""
+    if file_ext == '.json':
+        data = json.load(stream)
+        if isinstance(data, list):
+            return data
+        else:
+            return [data]
+    
+    elif file_ext == '.csv':
+        df = pd.read_csv(stream)
+        return df.to_dict('records')
+    
+    else:
+        raise ValueError(f"Unsupported file type: {file_ext}")
 
 def process_file(filepath):
     """Process uploaded JSON or CSV file"""
     try:
         file_ext = os.path.splitext(filepath)[1].lower()
-        
-        if file_ext == '.json':
-            with open(filepath, 'r') as f:
-                data = json.load(f)
-            if isinstance(data, list):
-                return data
-            else:
-                return [data]
-        
-        elif file_ext == '.csv':
-            df = pd.read_csv(filepath)
-            return df.to_dict('records')
-        
-        else:
-            raise ValueError(f"Unsupported file type: {file_ext}")
+        with open(filepath, 'rb') as f:
+            fadvise(f.fileno(), 'POSIX_FADV_SEQUENTIAL')
+            return parse_records(f, file_ext)
             
     except Exception as e:
         print(f"Error processing file: {e}")
         raise
 
-@app.route('/')
-def index():
-    """Enhanced dashboard with beautiful charts and animations"""
-    return '''
+def upload_path(filename):
+    """A fresh path under uploads/ so same-name uploads never share a file"""
+    return os.path.join(UPLOAD_FOLDER, f'{uuid.uuid4().hex}_{filename}')
+
+def remove_upload(filepath):
+    try:
+        os.remove(filepath)
+    except FileNotFoundError:
+        pass
+
+def ingest_file(filepath):
+    """Parse an uploaded file, add its records to the stream and delete it"""
+    try:
+        data = process_file(filepath)
+    finally:
+        remove_upload(filepath)
+    add_data_to_stream(data)
+    return len(data)
+
+def chunk_dir(upload_id):
+    """Return the chunk directory for an upload id, or None if the id is malformed"""
+    try:
+        if uuid.UUID(upload_id).hex != upload_id:
+            return None
+    except (TypeError, ValueError):
+        return None
+    return os.path.join(CHUNK_FOLDER, upload_id)
+
+def read_manifest(directory):
+    with open(os.path.join(directory, 'manifest.json')) as f:
+        return json.load(f)
+
+def write_manifest(directory, manifest):
+    tmp_path = os.path.join(directory, 'manifest.json.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, os.path.join(directory, 'manifest.json'))
+
+def reap_stale_chunk_dirs():
+    """Delete chunked uploads whose manifest has not changed within CHUNK_UPLOAD_TTL"""
+    cutoff = time.time() - CHUNK_UPLOAD_TTL
+    try:
+        entries = list(os.scandir(CHUNK_FOLDER))
+    except FileNotFoundError:
+        return
+    for entry in entries:
+        try:
+            if os.stat(os.path.join(entry.path, 'manifest.json')).st_mtime >= cutoff:
+                continue
+        except FileNotFoundError:
+            # No manifest yet (or a stray entry): fall back to the entry itself
+            try:
+                if entry.stat().st_mtime >= cutoff:
+                    continue
+            except FileNotFoundError:
+                continue
+        shutil.rmtree(entry.path, ignore_errors=True)
+
+def concatenate_chunks(directory, total_chunks, filepath):
+    """Join chunk files in order, copying in kernel space where supported"""
+    # Unbuffered so fallback writes and sendfile share one file offset
+    with open(filepath, 'wb', buffering=0) as dst:
+        fadvise(dst.fileno(), 'POSIX_FADV_SEQUENTIAL')
+        for index in range(total_chunks):
+            with open(os.path.join(directory, str(index)), 'rb') as src:
+                size = os.fstat(src.fileno()).st_size
+                offset = 0
+                try:
+                    while offset < size:
+                        sent = os.sendfile(dst.fileno(), src.fileno(), offset, size - offset)
+                        if sent == 0:
+                            break
+                        offset += sent
+                except (AttributeError, OSError):
+                    # Platforms where sendfile only targets sockets
+                    src.seek(offset)
+                    copy_to_fd(src, dst.fileno())
+        fadvise(dst.fileno(), 'POSIX_FADV_WILLNEED')
+
+def ingest_chunked_upload(directory, total_chunks, filepath):
+    """Reassemble a chunked upload, then parse it into the stream"""
+    try:
+        concatenate_chunks(directory, total_chunks, filepath)
+    except Exception:
+        remove_upload(filepath)
+        raise
+    # Only the chunk data goes now; the manifest, marked completing, keeps
+    # answering repeat completes with a 409 until the stale-upload sweep
+    for index in range(total_chunks):
+        os.remove(os.path.join(directory, str(index)))
+    return ingest_file(filepath)
+
+def ingest_upload(payload, file_ext):
+    """Parse an in-memory upload and add its records to the stream"""
+    try:
+        data = parse_records(io.BytesIO(payload), file_ext)
+    except Exception as e:
+        print(f"Error processing upload: {e}")
+        raise
+    add_data_to_stream(data)
+    return len(data)
+
+# Enhanced dashboard page with beautiful charts and animations
+DASHBOARD_HTML = '''
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -312,7 +601,8 @@ def index():
             background: var(--card-bg);
         }
         
-        .upload-zone:hover {
+        .upload-zone:hover,
+        .upload-zone.drag-over {
             border-color: #667eea;
             background: rgba(102, 126, 234, 0.1);
         }
@@ -468,6 +758,16 @@ def index():
     <script>
         let charts = {};
         
+        // Client copy of the server ring buffer (MAX_RECORDS on the server)
+        const MAX_RECORDS = 1000;
+        let records = [];
+        let cursor = 0;
+        let lastRefresh = 0;
+        let refreshTimer = 0;
+        let pollTimer = 0;
+        let renderFrame = 0;
+        let renderPending = false;
+        
         function loadSample() {
             updateStatus('loading', 'Loading sample data...', 'loading');
             
@@ -487,78 +787,153 @@ def index():
         }
 
         function refreshData() {
+            // Collapse bursts (sample load, upload completion, tab focus) into at
+            // most one fetch per 2s; a call inside the window runs when it ends,
+            // so the newest data is still fetched
+            const wait = lastRefresh + 2000 - Date.now();
+            if (wait > 0) {
+                if (!refreshTimer) {
+                    refreshTimer = setTimeout(() => {
+                        refreshTimer = 0;
+                        refreshData();
+                    }, wait);
+                }
+                return;
+            }
+            lastRefresh = Date.now();
+            
             fetch('/api/data')
                 .then(response => response.json())
                 .then(data => {
-                    updateDashboard(data.data);
+                    if (data.cursor >= cursor) {
+                        applyRecords({reset: true, end: data.cursor, data: data.data});
+                    }
                 })
                 .catch(error => {
                     console.error('Error refreshing data:', error);
                 });
         }
 
+        // Merge a snapshot or a delta covering write cursors [start, end)
+        function applyRecords(payload) {
+            if (payload.reset) {
+                records = payload.data;
+            } else {
+                if (payload.end <= cursor) return;
+                const rows = payload.start < cursor ? payload.data.slice(cursor - payload.start) : payload.data;
+                records.push(...rows);
+                if (records.length > MAX_RECORDS) records.splice(0, records.length - MAX_RECORDS);
+            }
+            cursor = payload.end;
+            scheduleRender();
+        }
+
+        // Render at most once per frame, and not at all while the tab is hidden
+        function scheduleRender() {
+            if (document.visibilityState !== 'visible') {
+                renderPending = true;
+                return;
+            }
+            if (!renderFrame) {
+                renderFrame = requestAnimationFrame(() => {
+                    renderFrame = 0;
+                    renderPending = false;
+                    updateDashboard(records);
+                });
+            }
+        }
+
+        document.addEventListener('visibilitychange', () => {
+            if (document.visibilityState === 'visible' && renderPending) scheduleRender();
+        });
+
         function updateDashboard(data) {
             if (data && data.length > 0) {
                 document.getElementById('kpi-section').style.display = 'block';
                 document.getElementById('charts-section').style.display = 'block';
                 document.getElementById('data-section').style.display = 'block';
                 
-                updateKPIs(data);
-                updateCharts(data);
+                const agg = aggregateAll(data);
+                updateKPIs(data, agg);
+                updateCharts(agg);
                 updateTable(data);
             }
         }
 
-        function updateKPIs(data) {
+        // Single scan over the records that feeds every KPI and chart
+        function aggregateAll(data) {
+            const agg = {
+                totalRevenue: 0,
+                convSum: 0, convCount: 0,
+                satSum: 0, satCount: 0,
+                byDate: new Map(),
+                byCategory: new Map(),
+                byRegion: new Map(),
+                byStatus: new Map()
+            };
+            const today = new Date().toISOString().split('T')[0];
+            
+            for (let i = 0; i < data.length; i++) {
+                const item = data[i];
+                const revenue = item.revenue || 0;
+                const conversion = item.conversion_rate || 0;
+                const satisfaction = item.customer_satisfaction || 0;
+                
+                if (!isNaN(revenue)) agg.totalRevenue += revenue;
+                if (!isNaN(conversion)) { agg.convSum += conversion; agg.convCount++; }
+                if (!isNaN(satisfaction)) { agg.satSum += satisfaction; agg.satCount++; }
+                
+                const date = item.date || today;
+                agg.byDate.set(date, (agg.byDate.get(date) || 0) + revenue);
+                
+                const cat = item.category || 'Other';
+                agg.byCategory.set(cat, (agg.byCategory.get(cat) || 0) + revenue);
+                
+                const region = item.region || 'Unknown';
+                agg.byRegion.set(region, (agg.byRegion.get(region) || 0) + revenue);
+                
+                const status = item.status || 'Unknown';
+                agg.byStatus.set(status, (agg.byStatus.get(status) || 0) + 1);
+            }
+            return agg;
+        }
+
+        function updateKPIs(data, agg) {
             // Total Records
             document.getElementById('total-records').textContent = data.length.toLocaleString();
             
             // Total Revenue
-            const revenues = data.map(d => d.revenue || 0).filter(r => !isNaN(r));
-            const totalRevenue = revenues.reduce((a, b) => a + b, 0);
-            document.getElementById('total-revenue').textContent = '$' + totalRevenue.toLocaleString();
+            document.getElementById('total-revenue').textContent = '$' + agg.totalRevenue.toLocaleString();
             
             // Average Conversion Rate
-            const conversions = data.map(d => d.conversion_rate || 0).filter(c => !isNaN(c));
-            const avgConversion = conversions.length > 0 ? 
-                (conversions.reduce((a, b) => a + b, 0) / conversions.length) : 0;
+            const avgConversion = agg.convCount > 0 ? agg.convSum / agg.convCount : 0;
             document.getElementById('conversion-rate').textContent = avgConversion.toFixed(1) + '%';
             
             // Average Satisfaction
-            const satisfactions = data.map(d => d.customer_satisfaction || 0).filter(s => !isNaN(s));
-            const avgSatisfaction = satisfactions.length > 0 ? 
-                (satisfactions.reduce((a, b) => a + b, 0) / satisfactions.length) : 0;
+            const avgSatisfaction = agg.satCount > 0 ? agg.satSum / agg.satCount : 0;
             document.getElementById('satisfaction').textContent = avgSatisfaction.toFixed(1);
         }
 
-        function updateCharts(data) {
+        function updateCharts(agg) {
             // Revenue Trend Chart
-            createRevenueChart(data);
+            createRevenueChart(agg.byDate);
             
             // Category Pie Chart
-            createCategoryChart(data);
+            createCategoryChart(agg.byCategory);
             
             // Regional Bar Chart
-            createRegionChart(data);
+            createRegionChart(agg.byRegion);
             
             // Funnel Chart
-            createFunnelChart(data);
+            createFunnelChart(agg.byStatus);
         }
 
-        function createRevenueChart(data) {
+        function createRevenueChart(dateGroups) {
             const ctx = document.getElementById('revenueChart').getContext('2d');
             
-            // Group by date
-            const dateGroups = {};
-            data.forEach(item => {
-                const date = item.date || new Date().toISOString().split('T')[0];
-                if (!dateGroups[date]) dateGroups[date] = [];
-                dateGroups[date].push(item.revenue || 0);
-            });
-            
-            const chartData = Object.keys(dateGroups).sort().map(date => ({
+            const chartData = [...dateGroups.keys()].sort().map(date => ({
                 x: date,
-                y: dateGroups[date].reduce((a, b) => a + b, 0)
+                y: dateGroups.get(date)
             }));
             
             if (charts.revenue) charts.revenue.destroy();
@@ -597,23 +972,17 @@ def index():
             });
         }
 
-        function createCategoryChart(data) {
+        function createCategoryChart(categories) {
             const ctx = document.getElementById('categoryChart').getContext('2d');
             
-            const categories = {};
-            data.forEach(item => {
-                const cat = item.category || 'Other';
-                categories[cat] = (categories[cat] || 0) + (item.revenue || 0);
-            });
-            
             if (charts.category) charts.category.destroy();
             
             charts.category = new Chart(ctx, {
                 type: 'doughnut',
                 data: {
-                    labels: Object.keys(categories),
+                    labels: [...categories.keys()],
                     datasets: [{
-                        data: Object.values(categories),
+                        data: [...categories.values()],
                         backgroundColor: [
                             '#667eea', '#764ba2', '#f093fb', '#f5576c',
                             '#4facfe', '#00f2fe', '#43e97b', '#38f9d7'
@@ -633,24 +1002,18 @@ def index():
             });
         }
 
-        function createRegionChart(data) {
+        function createRegionChart(regions) {
             const ctx = document.getElementById('regionChart').getContext('2d');
             
-            const regions = {};
-            data.forEach(item => {
-                const region = item.region || 'Unknown';
-                regions[region] = (regions[region] || 0) + (item.revenue || 0);
-            });
-            
             if (charts.region) charts.region.destroy();
             
             charts.region = new Chart(ctx, {
                 type: 'bar',
                 data: {
-                    labels: Object.keys(regions),
+                    labels: [...regions.keys()],
                     datasets: [{
                         label: 'Revenue by Region',
-                        data: Object.values(regions),
+                        data: [...regions.values()],
                         backgroundColor: 'rgba(102, 126, 234, 0.8)',
                         borderColor: 'rgb(102, 126, 234)',
                         borderWidth: 1
@@ -676,24 +1039,18 @@ def index():
             });
         }
 
-        function createFunnelChart(data) {
+        function createFunnelChart(statuses) {
             const ctx = document.getElementById('funnelChart').getContext('2d');
             
-            const statuses = {};
-            data.forEach(item => {
-                const status = item.status || 'Unknown';
-                statuses[status] = (statuses[status] || 0) + 1;
-            });
-            
             if (charts.funnel) charts.funnel.destroy();
             
             charts.funnel = new Chart(ctx, {
                 type: 'bar',
                 data: {
-                    labels: Object.keys(statuses),
+                    labels: [...statuses.keys()],
                     datasets: [{
                         label: 'Records by Status',
-                        data: Object.values(statuses),
+                        data: [...statuses.values()],
                         backgroundColor: [
                             'rgba(40, 167, 69, 0.8)',
                             'rgba(255, 193, 7, 0.8)',
@@ -773,9 +1130,16 @@ def index():
         }
 
         // File upload handling
+        // Files above one chunk are sent as parallel, resumable chunks
+        const CHUNK_SIZE = 8 * 1024 * 1024;
+        const CHUNK_CONCURRENCY = 4;
+        const CHUNK_ATTEMPTS = 3;
+
         document.getElementById('fileInput').addEventListener('change', function(e) {
             const file = e.target.files[0];
-            if (file) {
+            if (file && file.size > CHUNK_SIZE) {
+                uploadChunked(file);
+            } else if (file) {
                 const formData = new FormData();
                 formData.append('file', file);
                 
@@ -788,9 +1152,9 @@ def index():
                 .then(response => response.json())
                 .then(data => {
                     if (data.success) {
-                        updateStatus('success', data.message, 'connected');
+                        updateStatus('loading', data.message, 'loading');
                         hideUpload();
-                        refreshData();
+                        pollUpload(data.job_id);
                     } else {
                         updateStatus('danger', 'Upload failed: ' + data.error, 'error');
                     }
@@ -801,25 +1165,105 @@ def index():
             }
         });
 
+        function postJSON(url, body) {
+            return fetch(url, {
+                method: 'POST',
+                headers: {'Content-Type': 'application/json'},
+                body: JSON.stringify(body)
+            }).then(response => response.json());
+        }
+
+        function sendChunk(uploadId, file, index) {
+            const formData = new FormData();
+            formData.append('upload_id', uploadId);
+            formData.append('chunk_index', index);
+            formData.append('chunk', file.slice(index * CHUNK_SIZE, (index + 1) * CHUNK_SIZE));
+            // Failed chunks are reported back as missing by /upload/complete
+            return fetch('/upload/chunk', {method: 'POST', body: formData}).catch(() => null);
+        }
+
+        async function runWithConcurrency(items, limit, worker) {
+            const queue = items.slice();
+            const runners = Array.from({length: Math.min(limit, queue.length)}, async () => {
+                while (queue.length > 0) await worker(queue.shift());
+            });
+            await Promise.all(runners);
+        }
+
+        async function uploadChunked(file) {
+            const totalChunks = Math.ceil(file.size / CHUNK_SIZE);
+            updateStatus('loading', `Uploading file in ${totalChunks} chunks...`, 'loading');
+            
+            try {
+                const init = await postJSON('/upload/init', {filename: file.name, total_chunks: totalChunks, total_size: file.size});
+                if (!init.success) throw new Error(init.error);
+                
+                let pending = [...Array(totalChunks).keys()];
+                for (let attempt = 0; attempt < CHUNK_ATTEMPTS; attempt++) {
+                    await runWithConcurrency(pending, CHUNK_CONCURRENCY, index => sendChunk(init.upload_id, file, index));
+                    
+                    const data = await postJSON('/upload/complete', {upload_id: init.upload_id});
+                    if (data.success) {
+                        updateStatus('loading', data.message, 'loading');
+                        hideUpload();
+                        pollUpload(data.job_id);
+                        return;
+                    }
+                    if (!data.missing) throw new Error(data.error);
+                    pending = data.missing;
+                }
+                throw new Error(`${pending.length} chunks failed after ${CHUNK_ATTEMPTS} attempts`);
+            } catch (error) {
+                updateStatus('danger', 'Upload error: ' + error.message, 'error');
+            }
+        }
+
+        function pollUpload(jobId) {
+            fetch(`/api/upload_status/${jobId}`)
+                .then(response => response.json())
+                .then(data => {
+                    if (data.status === 'pending') {
+                        setTimeout(() => pollUpload(jobId), 500);
+                    } else if (data.success) {
+                        updateStatus('success', `${data.message} - ${data.records} records loaded`, 'connected');
+                        refreshData();
+                    } else {
+                        updateStatus('danger', 'Processing failed: ' + data.error, 'error');
+                    }
+                })
+                .catch(error => {
+                    updateStatus('danger', 'Upload error: ' + error, 'error');
+                });
+        }
+
         // Drag and drop functionality
         const uploadZone = document.getElementById('uploadZone');
         
+        let dragFrame = 0;
+        
+        // dragover fires on every mouse move; touch the class at most once per frame
         uploadZone.addEventListener('dragover', function(e) {
             e.preventDefault();
-            uploadZone.style.borderColor = '#667eea';
-            uploadZone.style.background = 'rgba(102, 126, 234, 0.1)';
+            if (!dragFrame) {
+                dragFrame = requestAnimationFrame(() => {
+                    uploadZone.classList.add('drag-over');
+                    dragFrame = 0;
+                });
+            }
         });
         
         uploadZone.addEventListener('dragleave', function(e) {
             e.preventDefault();
-            uploadZone.style.borderColor = '#30363d';
-            uploadZone.style.background = '#161b22';
+            cancelAnimationFrame(dragFrame);
+            dragFrame = 0;
+            uploadZone.classList.remove('drag-over');
         });
         
         uploadZone.addEventListener('drop', function(e) {
             e.preventDefault();
-            uploadZone.style.borderColor = '#30363d';
-            uploadZone.style.background = '#161b22';
+            cancelAnimationFrame(dragFrame);
+            dragFrame = 0;
+            uploadZone.classList.remove('drag-over');
             
             const files = e.dataTransfer.files;
             if (files.length > 0) {
@@ -828,101 +1272,365 @@ def index():
             }
         });
 
-        // Auto-refresh every 30 seconds
-        setInterval(refreshData, 30000);
+        // New records are pushed by the server as they are ingested
+        const dataStream = new EventSource('/api/stream');
+        dataStream.addEventListener('records', e => applyRecords(JSON.parse(e.data)));
+        // Network drops reconnect on their own; a refused stream (server at its
+        // stream limit) closes for good, so poll for updates instead
+        dataStream.addEventListener('error', () => {
+            if (dataStream.readyState === EventSource.CLOSED && !pollTimer) {
+                pollTimer = setInterval(refreshData, 5000);
+            }
+        });
     </script>
 </body>
 </html>
     '''
 
+# The page is static, so it is encoded and fingerprinted once at import
+DASHBOARD_HTML_BYTES = DASHBOARD_HTML.encode('utf-8')
+DASHBOARD_ETAG = hashlib.blake2b(DASHBOARD_HTML_BYTES, digest_size=12).hexdigest()
+# Compressed once at the highest level instead of per request in compress_response
+DASHBOARD_HTML_GZ = gzip.compress(DASHBOARD_HTML_BYTES, 9)
+
+@app.route('/')
+def index():
+    """Enhanced dashboard with beautiful charts and animations"""
+    if 'gzip' in request.headers.get('Accept-Encoding', '').lower():
+        response = Response(DASHBOARD_HTML_GZ, mimetype='text/html')
+        response.headers['Content-Encoding'] = 'gzip'
+        response.set_etag(DASHBOARD_ETAG + '-gz')
+    else:
+        response = Response(DASHBOARD_HTML_BYTES, mimetype='text/html')
+        response.set_etag(DASHBOARD_ETAG)
+    response.vary.add('Accept-Encoding')
+    response.cache_control.public = True
+    response.cache_control.max_age = 300
+    return response.make_conditional(request)
+
 @app.route('/api/sample')
 def load_sample():
     """Load enhanced sample data"""
     try:
         sample_data = create_enhanced_sample_data()
         add_data_to_stream(sample_data)
-        return jsonify({
+        wake_simulation()
+        return json_response({
             'success': True,
             'message': 'Enhanced sample data loaded successfully',
             'records': len(sample_data)
         })
     except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+        return json_response({'success': False, 'error': str(e)}, 500)
 
 @app.route('/api/data')
 def get_data():
     """Get current data"""
+    global data_cache
+    # Only the snapshot is taken under the lock; encoding happens outside it
     with data_lock:
-        return jsonify({
-            'data': current_data,
-            'total_records': len(current_data),
-            'timestamp': time.time()
+        version = data_version
+        cached_version, body = data_cache
+        if cached_version != version:
+            records = snapshot_records()
+            cursor = records_written
+            updated_at = data_updated_at
+    
+    if cached_version != version:
+        body = dumps_json({
+            'data': records,
+            'total_records': len(records),
+            'cursor': cursor,
+            'timestamp': updated_at
         })
+        with data_lock:
+            if data_cache[0] is None or data_cache[0] < version:
+                data_cache = (version, body)
+    
+    # Unchanged data revalidates as 304 with an empty body
+    response = Response(body, mimetype='application/json')
+    response.set_etag(str(version), weak=True)
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+@app.route('/api/stream')
+def stream():
+    """Server-Sent Events feed of records appended since the client's cursor"""
+    # EventSource resends the last event id (our write cursor) on reconnect
+    last_event_id = request.headers.get('Last-Event-ID', '')
+    cursor = int(last_event_id) if last_event_id.isdigit() else None
+    
+    if not stream_slots.acquire(blocking=False):
+        response = json_response({'success': False, 'error': 'Too many open streams; poll /api/data'}, 503)
+        response.headers['Retry-After'] = str(STREAM_RETRY_AFTER)
+        return response
+    
+    def events(cursor):
+        while True:
+            with data_changed:
+                data_changed.wait_for(lambda: records_written != cursor, timeout=STREAM_KEEPALIVE)
+                written = records_written
+                if written == cursor:
+                    rows = None
+                elif cursor is None or cursor > written or written - cursor > MAX_RECORDS:
+                    # New client, restarted server or too far behind: resend the window
+                    rows, reset = snapshot_records(), True
+                else:
+                    rows, reset = records_since(cursor), False
+            
+            if rows is None:
+                # Comment line keeps proxies from closing an idle stream
+                yield ': keepalive\n\n'
+                continue
+            
+            payload = dumps_json({
+                'reset': reset,
+                'start': written - len(rows),
+                'end': written,
+                'data': rows
+            })
+            cursor = written
+            yield f'id: {written}\nevent: records\ndata: {payload.decode()}\n\n'
+    
+    response = Response(events(cursor), mimetype='text/event-stream',
+                        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+    # The server closes the response when the client goes away, even before
+    # the generator has started, so the slot is always handed back
+    response.call_on_close(stream_slots.release)
+    return response
 
 @app.route('/upload', methods=['POST'])
 def upload_file():
     """Handle file upload"""
     try:
         if 'file' not in request.files:
-            return jsonify({'success': False, 'error': 'No file selected'}), 400
+            return json_response({'success': False, 'error': 'No file selected'}, 400)
         
         file = request.files['file']
         if file.filename == '':
-            return jsonify({'success': False, 'error': 'No file selected'}), 400
+            return json_response({'success': False, 'error': 'No file selected'}, 400)
         
         if file and file.filename and allowed_file(file.filename):
             filename = secure_filename(str(file.filename))
-            filepath = os.path.join(UPLOAD_FOLDER, filename)
-            file.save(filepath)
             
-            # Process the file
-            data = process_file(filepath)
-            add_data_to_stream(data)
+            # Parse in the background so the request returns immediately
+            if request.content_length is not None and request.content_length < IN_MEMORY_UPLOAD_LIMIT:
+                file_ext = os.path.splitext(str(file.filename))[1].lower()
+                future = PARSE_POOL.submit(ingest_upload, file.read(), file_ext)
+            else:
+                filepath = upload_path(filename)
+                save_upload_stream(file.stream, filepath)
+                future = PARSE_POOL.submit(ingest_file, filepath)
             
-            return jsonify({
+            return json_response({
                 'success': True,
-                'message': f'File {filename} uploaded successfully',
-                'records': len(data)
-            })
+                'message': f'File {filename} uploaded, processing...',
+                'job_id': register_upload_job(filename, future)
+            }, 202)
         else:
-            return jsonify({'success': False, 'error': 'Invalid file type'}), 400
+            return json_response({'success': False, 'error': 'Invalid file type'}, 400)
+            
+    except Exception as e:
+        return json_response({'success': False, 'error': str(e)}, 500)
+
+@app.route('/upload/init', methods=['POST'])
+def upload_init():
+    """Start a resumable chunked upload"""
+    try:
+        params = request.get_json(silent=True) or {}
+        filename = secure_filename(str(params.get('filename') or ''))
+        total_chunks = params.get('total_chunks')
+        total_size = params.get('total_size')
+        
+        if not filename or not allowed_file(filename):
+            return json_response({'success': False, 'error': 'Invalid file type'}, 400)
+        if not isinstance(total_size, int) or total_size <= 0:
+            return json_response({'success': False, 'error': 'Invalid file size'}, 400)
+        if total_size > MAX_CHUNKED_UPLOAD_SIZE:
+            return json_response({'success': False, 'error': 'File too large'}, 413)
+        if (not isinstance(total_chunks, int) or not 0 < total_chunks <= MAX_UPLOAD_CHUNKS
+                or total_chunks * MAX_CHUNK_SIZE < total_size):
+            return json_response({'success': False, 'error': 'Invalid chunk count'}, 400)
+        
+        # Abandoned uploads are cleaned up as new ones start
+        reap_stale_chunk_dirs()
+        
+        upload_id = uuid.uuid4().hex
+        directory = os.path.join(CHUNK_FOLDER, upload_id)
+        os.makedirs(directory)
+        write_manifest(directory, {
+            'filename': filename,
+            'total_chunks': total_chunks,
+            'total_size': total_size,
+            'received': [0] * total_chunks,
+            'sizes': [0] * total_chunks,
+            'completing': False
+        })
+        
+        return json_response({'success': True, 'upload_id': upload_id})
+        
+    except Exception as e:
+        return json_response({'success': False, 'error': str(e)}, 500)
+
+@app.route('/upload/chunk', methods=['POST'])
+def upload_chunk():
+    """Store one chunk of a resumable upload; chunks may arrive in any order"""
+    try:
+        # Checked before request.form parses the body; the slack covers multipart headers
+        if request.content_length is not None and request.content_length > MAX_CHUNK_SIZE + 64 * 1024:
+            return json_response({'success': False, 'error': 'Chunk too large'}, 413)
+        
+        directory = chunk_dir(request.form.get('upload_id', ''))
+        if directory is None or not os.path.isdir(directory):
+            return json_response({'success': False, 'error': 'Unknown upload'}, 404)
+        
+        with chunk_lock:
+            manifest = read_manifest(directory)
+        if manifest.get('completing'):
+            return json_response({'success': False, 'error': 'Upload already completing'}, 409)
+        total_chunks = manifest['total_chunks']
+        
+        chunk = request.files.get('chunk')
+        index = request.form.get('chunk_index', '')
+        if chunk is None or not index.isdigit() or int(index) >= total_chunks:
+            return json_response({'success': False, 'error': 'Invalid chunk'}, 400)
+        index = int(index)
+        
+        # Write under a unique name so a retried chunk never clobbers a partial write
+        part_path = os.path.join(directory, f'{index}.{uuid.uuid4().hex}.part')
+        save_upload_stream(chunk.stream, part_path)
+        size = os.path.getsize(part_path)
+        
+        with chunk_lock:
+            manifest = read_manifest(directory)
+            # A retried chunk replaces its earlier copy, so it does not count twice
+            others = sum(manifest['sizes']) - manifest['sizes'][index]
+            if manifest.get('completing') or size > MAX_CHUNK_SIZE or others + size > manifest['total_size']:
+                os.remove(part_path)
+                if manifest.get('completing'):
+                    return json_response({'success': False, 'error': 'Upload already completing'}, 409)
+                return json_response({'success': False, 'error': 'Chunk exceeds the declared upload size'}, 413)
+            os.replace(part_path, os.path.join(directory, str(index)))
+            manifest['received'][index] = 1
+            manifest['sizes'][index] = size
+            write_manifest(directory, manifest)
+        
+        return json_response({'success': True, 'received': sum(manifest['received'])})
+        
+    except Exception as e:
+        return json_response({'success': False, 'error': str(e)}, 500)
+
+@app.route('/upload/complete', methods=['POST'])
+def upload_complete():
+    """Reassemble a chunked upload and parse it in the background"""
+    try:
+        params = request.get_json(silent=True) or {}
+        directory = chunk_dir(str(params.get('upload_id') or ''))
+        if directory is None or not os.path.isdir(directory):
+            return json_response({'success': False, 'error': 'Unknown upload'}, 404)
+        
+        with chunk_lock:
+            try:
+                manifest = read_manifest(directory)
+            except FileNotFoundError:
+                return json_response({'success': False, 'error': 'Unknown upload'}, 404)
+            # Only the first complete reassembles; retries and races get a 409
+            if manifest.get('completing'):
+                return json_response({'success': False, 'error': 'Upload already completing'}, 409)
+            
+            # Report gaps so the client can resend just those chunks
+            missing = [i for i, received in enumerate(manifest['received']) if not received]
+            if missing:
+                return json_response({'success': False, 'error': 'Upload incomplete', 'missing': missing}, 409)
+            if sum(manifest['sizes']) != manifest['total_size']:
+                return json_response({'success': False, 'error': 'Upload size does not match'}, 400)
             
+            manifest['completing'] = True
+            write_manifest(directory, manifest)
+        
+        filename = manifest['filename']
+        filepath = upload_path(filename)
+        future = PARSE_POOL.submit(ingest_chunked_upload, directory, manifest['total_chunks'], filepath)
+        
+        return json_response({
+            'success': True,
+            'message': f'File {filename} uploaded, processing...',
+            'job_id': register_upload_job(filename, future)
+        }, 202)
+        
     except Exception as e:
-        return jsonify({'success': False, 'error': str(e)}), 500
+        return json_response({'success': False, 'error': str(e)}, 500)
+
+def register_upload_job(filename, future):
+    """Track a background parse and return its job id"""
+    job_id = upload_jobs.add(filename)
+    
+    def job_done(_):
+        error = future.exception()
+        upload_jobs.finish(job_id, records=None if error else future.result(), error=error)
+        wake_simulation()
+    
+    future.add_done_callback(job_done)
+    return job_id
+
+@app.route('/api/upload_status/<job_id>')
+def upload_status(job_id):
+    """Report progress of a background upload parse"""
+    return json_response(*upload_jobs.status(job_id))
 
 def simulate_real_time_data():
     """Background thread to simulate real-time data updates"""
-    time.sleep(10)  # Wait for server to start
+    delay = 10  # Wait for server to start
+    failing = False
     
     counter = 0
+    batch = []
     while True:
+        deadline = time.monotonic() + delay
+        while True:
+            woken = simulation_wake.wait(max(deadline - time.monotonic(), 0))
+            simulation_wake.clear()
+            # User activity only cuts short an error backoff; a healthy simulator
+            # keeps its interval, so waking it never adds an extra record
+            if not woken or failing or time.monotonic() >= deadline:
+                break
+        
         try:
-            # Generate new realistic data point
+            # Draw a batch of metrics up front, release one record per tick
+            if counter % SIMULATION_BATCH == 0:
+                batch = generate_simulated_batch()
+            
+            # Generate new realistic data point; both time fields share one clock read
+            now = datetime.now()
             new_record = {
                 'id': 10000 + counter,
-                'timestamp': datetime.now().isoformat(),
-                'date': datetime.now().strftime('%Y-%m-%d'),
-                'revenue': round(np.random.lognormal(6, 0.5), 2),
-                'cost': round(np.random.lognormal(5, 0.4), 2),
-                'category': np.random.choice(['Electronics', 'Clothing', 'Books']),
-                'region': np.random.choice(['North America', 'Europe', 'Asia Pacific']),
-                'status': np.random.choice(['Active', 'Pending', 'Completed']),
-                'conversion_rate': round(np.random.uniform(1, 15), 2),
-                'customer_satisfaction': round(np.random.uniform(3.0, 5.0), 1),
-                'units_sold': np.random.randint(1, 50),
-                'priority': np.random.choice(['High', 'Medium', 'Low']),
+                'timestamp': now.isoformat(),
+                'date': now.date().isoformat(),
+                **batch[counter % SIMULATION_BATCH],
             }
             
-            # Calculate derived metrics
-            new_record['profit'] = round(new_record['revenue'] - new_record['cost'], 2)
-            
             add_data_to_stream([new_record])
             counter += 1
-            time.sleep(15)  # Add new data every 15 seconds
+            failing = False
+            delay = SIMULATION_INTERVAL  # Add new data every 15 seconds
             
         except Exception as e:
             print(f"Real-time simulation error: {e}")
-            time.sleep(60)
+            # Back off exponentially, but recover on the next tick once healthy
+            failing = True
+            delay = min(max(delay, SIMULATION_INTERVAL) * 2, SIMULATION_MAX_BACKOFF)
+
+def wake_simulation():
+    """Retry a failing simulator now instead of waiting out its backoff"""
+    simulation_wake.set()
+
+def start_simulation():
+    """Start the background simulator once per process"""
+    global simulation_thread
+    with simulation_lock:
+        if simulation_thread is None:
+            simulation_thread = threading.Thread(target=simulate_real_time_data, daemon=True)
+            simulation_thread.start()
 
 if __name__ == '__main__':
     print("🚀 Starting Enhanced Real-Time Data Dashboard")
@@ -932,8 +1640,7 @@ if __name__ == '__main__':
     print("-" * 60)
     
     # Start background real-time simulation
-    simulation_thread = threading.Thread(target=simulate_real_time_data, daemon=True)
-    simulation_thread.start()
+    start_simulation()
     
     # Run the enhanced app
     app.run(host='0.0.0.0', port=5000, debug=False)
\ No newline at end of file
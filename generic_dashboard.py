@@ -12,28 +12,138 @@ and WebSocket real-time data visualization. This system supports:
 """
 
 import os
-import json
+
+# Run as a script with SOCKETIO_ASYNC_MODE=gevent or eventlet, the stdlib has
+# to be patched before the imports below, so locks, sleeps and the parse pool's
+# helper threads cooperate with the hub. A gevent/eventlet gunicorn worker
+# patches for itself; spawned parse workers never take this branch.
+if __name__ == '__main__':
+    if os.environ.get('SOCKETIO_ASYNC_MODE') == 'gevent':
+        from gevent import monkey
+        monkey.patch_all()
+    elif os.environ.get('SOCKETIO_ASYNC_MODE') == 'eventlet':
+        import eventlet
+        eventlet.monkey_patch()
+
+import hashlib
 import logging
 import threading
 import time
+import uuid
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from collections import Counter, OrderedDict, deque
+from itertools import islice
+import orjson
 import pandas as pd
 import numpy as np
 from datetime import datetime
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, render_template, request, jsonify
+from flask.json.provider import JSONProvider
 from flask_socketio import SocketIO, emit
 from werkzeug.utils import secure_filename
 from werkzeug.middleware.proxy_fix import ProxyFix
 import dash
-from dash import dcc, html, callback, Input, Output, State
+from dash import dcc, html, dash_table, callback, Input, Output, State, Patch
 import dash_bootstrap_components as dbc
 import plotly.express as px
 import plotly.graph_objects as go
 import socketio as sio_client
+from json_codec import OrjsonCodec, dumps_json
+from upload_io import UploadJobs
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# CSV uploads are parsed this many rows at a time to bound peak memory
+CSV_CHUNK_ROWS = 50000
+# String fields with more distinct values than this (timestamps, ids) are not
+# categorical: their running counts are dropped and charts read the frame instead
+MAX_CATEGORY_VALUES = 256
+# Simulated records are drawn in batches; categorical fields come from these labels
+SIMULATION_BATCH = 64
+SIMULATION_LABELS = {
+    'category': ('Electronics', 'Clothing', 'Books'),
+    'region': ('North', 'South', 'East', 'West'),
+    'status': ('active', 'inactive', 'pending')
+}
+
+def process_file(filepath, max_records):
+    """Process uploaded file into (records to stream, total rows in the file).
+    
+    Only the newest max_records rows fit in the stream buffer, so only those are
+    turned into record dicts. Module-level so it can run in the parse pool.
+    """
+    try:
+        file_ext = os.path.splitext(filepath)[1].lower()
+        
+        if file_ext == '.json':
+            with open(filepath, 'rb') as f:
+                data = orjson.loads(f.read())
+            if not isinstance(data, list):
+                data = [data]
+            return data[-max_records:], len(data)
+        
+        elif file_ext == '.csv':
+            # Read in chunks so peak memory is one chunk plus the kept tail
+            tail = None
+            total_rows = 0
+            for chunk in pd.read_csv(filepath, chunksize=CSV_CHUNK_ROWS):
+                total_rows += len(chunk)
+                tail = chunk if tail is None else pd.concat([tail, chunk])
+                tail = tail.tail(max_records)
+            if tail is None:
+                return [], 0
+            return tail.to_dict('records'), total_rows
+        
+        else:
+            raise ValueError(f"Unsupported file type: {file_ext}")
+            
+    except Exception as e:
+        logger.error(f"Error processing file {filepath}: {str(e)}")
+        raise
+
+# Time series updates of up to this many rows are sent as a Patch, not a new figure
+MAX_PATCH_ROWS = 200
+
+# Line charts keep at most 4 points (first, last, min, max) per horizontal bucket
+CHART_BUCKETS = 800
+
+def m4_downsample(x, y, buckets=CHART_BUCKETS):
+    """Return indices of the M4 subset of a series sorted by x.
+    
+    Keeping the first, last, min and max point of each x bucket draws the same
+    line at chart resolution while sending O(buckets) points instead of O(N).
+    """
+    n = len(x)
+    if n <= 4 * buckets:
+        return np.arange(n)
+    
+    position = x.view('i8') if x.dtype.kind == 'M' else x.astype(np.float64)
+    edges = np.linspace(position[0], position[-1], buckets + 1)
+    bucket = np.clip(np.searchsorted(edges, position, side='right') - 1, 0, buckets - 1)
+    
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    ends = np.r_[starts[1:], n] - 1
+    # Within each bucket order rows by y: group heads are minima, tails maxima
+    by_value = np.lexsort((y, bucket))
+    sorted_bucket = bucket[by_value]
+    heads = np.flatnonzero(np.r_[True, sorted_bucket[1:] != sorted_bucket[:-1]])
+    tails = np.r_[heads[1:], n] - 1
+    
+    return np.unique(np.concatenate([starts, ends, by_value[heads], by_value[tails]]))
+
+class OrjsonProvider(JSONProvider):
+    """Flask JSON provider backed by orjson, used by jsonify and request.get_json"""
+    
+    def dumps(self, obj, **kwargs):
+        return dumps_json(obj).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 class GenericDataDashboard:
     def __init__(self):
         """Initialize the generic data dashboard"""
@@ -41,22 +151,65 @@ class GenericDataDashboard:
         self.app = Flask(__name__)
         self.app.secret_key = os.environ.get("SESSION_SECRET", "generic-dashboard-key")
         self.app.wsgi_app = ProxyFix(self.app.wsgi_app, x_proto=1, x_host=1)
+        self.app.json = OrjsonProvider(self.app)
         
-        # SocketIO setup
+        # SocketIO setup. Threading mode already serves real WebSocket transport
+        # (via simple-websocket); set SOCKETIO_ASYNC_MODE=eventlet or gevent to use
+        # green threads instead when one of those servers is installed (the
+        # stdlib is patched for them at the top of this module).
         self.socketio = SocketIO(
             self.app, 
             cors_allowed_origins="*",
-            async_mode='threading'
+            async_mode=os.environ.get('SOCKETIO_ASYNC_MODE', 'threading'),
+            json=OrjsonCodec
         )
         
-        # Data storage
-        self.current_data = []
-        self.data_lock = threading.Lock()
-        
         # Configuration
         self.upload_folder = 'uploads'
         self.allowed_extensions = {'json', 'csv'}
         self.max_records = 1000
+        self.flush_interval_ms = 250
+        self.simulation_rng = np.random.default_rng()
+        self.parsed_cache_size = 8
+        
+        # Data storage: bounded deque drops the oldest records as new ones arrive;
+        # seq counts every record ever added so clients can merge deltas
+        self.current_data = deque(maxlen=self.max_records)
+        self.seq = 0
+        self.updated_at = time.time()
+        self.data_lock = threading.Lock()
+        
+        # Per-field counts of the string values currently in the buffer,
+        # maintained on insert and evict so charts never rescan for them
+        self.category_counts = {}
+        self.uncounted_fields = set()
+        
+        # Serialized /api/data body for the seq it was built from
+        self.payload_cache = (-1, b'')
+        
+        # Parsed uploads keyed by content-addressed file name, least recently used first
+        self.parsed_cache = OrderedDict()
+        self.parsed_cache_lock = threading.Lock()
+        
+        # Uploads are parsed in worker processes so request threads stay free;
+        # a pool broken by a dead worker is replaced on the next submit
+        self.parse_pool = self._new_parse_pool()
+        self.parse_pool_lock = threading.Lock()
+        
+        # Background parse outcomes by job id, for /api/upload_status
+        self.upload_jobs = UploadJobs()
+        
+        # Rows appended since the last broadcast; one flush task drains them per window
+        self.pending_rows = []
+        self.flush_scheduled = False
+        
+        # Columnar (DataFrame) view of current_data, rebuilt at most once per seq
+        self.frame_cache = (-1, pd.DataFrame(), {})
+        # Rendered dashboard outputs for the seq they were built from
+        self.figure_cache = (-1, None)
+        self.timeseries_cache = (-1, None, None)
+        # Column roles keyed by a frame's (column, dtype) signature
+        self.schema_cache = {}
         
         # Create directories
         for directory in [self.upload_folder, 'sample_data']:
@@ -93,18 +246,35 @@ class GenericDataDashboard:
                 
                 if self._allowed_file(file.filename):
                     filename = secure_filename(str(file.filename))
-                    filepath = os.path.join(self.upload_folder, filename)
-                    file.save(filepath)
+                    filepath = self._save_upload(file.stream, filename)
+                    
+                    # Identical content uploaded recently is not parsed again;
+                    # the content-addressed name (digest + extension) is the key
+                    content_key = os.path.basename(filepath)
+                    with self.parsed_cache_lock:
+                        parsed = self.parsed_cache.get(content_key)
+                        if parsed is not None:
+                            self.parsed_cache.move_to_end(content_key)
+                    
+                    if parsed is not None:
+                        data, total_rows = parsed
+                        self._add_data_to_stream(data)
+                        return jsonify({
+                            'success': True,
+                            'message': f'File {filename} uploaded successfully',
+                            'records': total_rows
+                        })
                     
-                    # Process and add data
-                    data = self._process_file(filepath)
-                    self._add_data_to_stream(data)
+                    # Parse in the pool; completion is pushed to clients as
+                    # 'upload_done' and can be polled at /api/upload_status
+                    job_id = self.upload_jobs.add(filename)
+                    self._start_parse(job_id, filename, filepath, content_key)
                     
                     return jsonify({
                         'success': True,
-                        'message': f'File {filename} uploaded successfully',
-                        'records': len(data)
-                    })
+                        'message': f'File {filename} uploaded, processing...',
+                        'job_id': job_id
+                    }), 202
                 else:
                     return jsonify({'error': 'Invalid file type'}), 400
                     
@@ -112,15 +282,37 @@ class GenericDataDashboard:
                 logger.error(f"Upload error: {str(e)}")
                 return jsonify({'error': str(e)}), 500
         
+        @self.app.route('/api/upload_status/<job_id>')
+        def upload_status(job_id):
+            """Report progress of a background upload parse"""
+            payload, status = self.upload_jobs.status(job_id)
+            return jsonify(payload), status
+        
         @self.app.route('/api/data')
         def get_data():
             """Get current data"""
+            # Serialize once per seq; polls between writes reuse the same bytes
             with self.data_lock:
-                return jsonify({
-                    'data': self.current_data,
-                    'total_records': len(self.current_data),
-                    'timestamp': time.time()
+                seq = self.seq
+                cached_seq, body = self.payload_cache
+                if cached_seq != seq:
+                    records = list(self.current_data)
+                    updated_at = self.updated_at
+            
+            if cached_seq != seq:
+                body = dumps_json({
+                    'data': records,
+                    'total_records': len(records),
+                    'timestamp': updated_at
                 })
+                with self.data_lock:
+                    if self.payload_cache[0] < seq:
+                        self.payload_cache = (seq, body)
+            
+            response = Response(body, mimetype='application/json')
+            response.set_etag(str(seq), weak=True)
+            response.cache_control.no_cache = True
+            return response.make_conditional(request)
         
         @self.app.route('/api/sample')
         def load_sample():
@@ -139,13 +331,8 @@ class GenericDataDashboard:
         @self.socketio.on('connect')
         def handle_connect():
             logger.info('Client connected')
-            # Send current data to new client
-            with self.data_lock:
-                emit('new_data', {
-                    'data': self.current_data,
-                    'total_records': len(self.current_data),
-                    'timestamp': time.time()
-                })
+            # Send current data to new client; later updates arrive as deltas
+            emit('snapshot', self._snapshot_payload())
         
         @self.socketio.on('disconnect')
         def handle_disconnect():
@@ -154,12 +341,7 @@ class GenericDataDashboard:
         @self.socketio.on('request_data')
         def handle_data_request():
             """Handle data request from client"""
-            with self.data_lock:
-                emit('new_data', {
-                    'data': self.current_data,
-                    'total_records': len(self.current_data),
-                    'timestamp': time.time()
-                })
+            emit('snapshot', self._snapshot_payload())
     
     def _setup_dash_app(self):
         """Setup Dash application for visualizations"""
@@ -177,7 +359,8 @@ class GenericDataDashboard:
         
         # Dash layout
         self.dash_app.layout = dbc.Container([
-            dcc.Store(id='data-store'),
+            dcc.Store(id='data-seq', data=-1),
+            dcc.Store(id='timeseries-state'),
             dcc.Interval(id='interval-component', interval=5000, n_intervals=0),
             
             # Header
@@ -244,153 +427,388 @@ class GenericDataDashboard:
         
         @self.dash_app.callback(
             [
-                Output('data-store', 'data'),
+                Output('data-seq', 'data'),
                 Output('connection-status', 'children'),
                 Output('connection-status', 'color')
             ],
-            [Input('interval-component', 'n_intervals')]
+            [Input('interval-component', 'n_intervals')],
+            [State('data-seq', 'data')]
         )
-        def update_data_store(n_intervals):
+        def update_data_store(n_intervals, last_seq):
             try:
-                # Get current data
+                # Records stay on the server; the browser only holds seq, and it
+                # is left untouched until new records arrive so charts don't rebuild
                 with self.data_lock:
-                    data = self.current_data.copy()
+                    seq = self.seq
+                    total = len(self.current_data)
                 
-                if data:
-                    status_msg = f"Connected - {len(data)} records (last update: {datetime.now().strftime('%H:%M:%S')})"
+                if total:
+                    status_msg = f"Connected - {total} records (last update: {datetime.now().strftime('%H:%M:%S')})"
                     status_color = "success"
                 else:
                     status_msg = f"Waiting for data... (refresh #{n_intervals})"
                     status_color = "warning"
                 
-                return data, status_msg, status_color
+                return (seq if seq != last_seq else dash.no_update), status_msg, status_color
                 
             except Exception as e:
                 logger.error(f"Error updating data store: {str(e)}")
-                return [], f"Error: {str(e)}", "danger"
+                return dash.no_update, f"Error: {str(e)}", "danger"
         
         @self.dash_app.callback(
             [
                 Output('kpi-cards', 'children'),
                 Output('overview-chart', 'figure'),
                 Output('distribution-chart', 'figure'),
-                Output('timeseries-chart', 'figure'),
                 Output('correlation-chart', 'figure'),
                 Output('scatter-chart', 'figure'),
                 Output('data-table', 'children')
             ],
             [
-                Input('data-store', 'data'),
+                Input('data-seq', 'data'),
                 Input('tabs', 'active_tab')
             ]
         )
-        def update_dashboard(data, active_tab):
-            if not data:
-                empty_fig = go.Figure().add_annotation(
-                    text="No data available",
-                    xref="paper", yref="paper",
-                    x=0.5, y=0.5, showarrow=False
-                )
-                empty_fig.update_layout(template="plotly_dark", height=400)
-                
+        def update_dashboard(seq, active_tab):
+            # Every tab is rendered up front, so switching tabs changes nothing
+            if dash.callback_context.triggered_id == 'tabs':
+                return [dash.no_update] * 6
+            
+            frame_seq, df, category_counts = self._current_frame()
+            cached_seq, outputs = self.figure_cache
+            if cached_seq == frame_seq:
+                return outputs
+            
+            if df.empty:
+                empty_fig = self._empty_figure()
                 return (
                     [dbc.Col([dbc.Card([dbc.CardBody([html.H5("No Data"), html.H2("0")])])], width=3)],
-                    empty_fig, empty_fig, empty_fig, empty_fig, empty_fig,
+                    empty_fig, empty_fig, empty_fig, empty_fig,
                     html.P("No data to display")
                 )
             
-            df = pd.DataFrame(data)
+            # Chart helpers may convert columns in place; keep the cached frame intact
+            df = df.copy()
             
             # KPI Cards
-            kpi_cards = self._create_kpi_cards(df)
+            kpi_cards = self._create_kpi_cards(df, category_counts)
             
             # Charts
             overview_fig = self._create_overview_chart(df)
-            distribution_fig = self._create_distribution_chart(df)
-            timeseries_fig = self._create_timeseries_chart(df)
+            distribution_fig = self._create_distribution_chart(df, category_counts)
+            # The time series has its own callback, but later charts have always
+            # seen the time column already converted to datetimes
+            self._convert_time_column(df)
             correlation_fig = self._create_correlation_chart(df)
             scatter_fig = self._create_scatter_chart(df)
             
             # Data table
             data_table = self._create_data_table(df)
             
-            return (
+            outputs = (
                 kpi_cards, overview_fig, distribution_fig, 
-                timeseries_fig, correlation_fig, scatter_fig, data_table
+                correlation_fig, scatter_fig, data_table
             )
+            self.figure_cache = (frame_seq, outputs)
+            return outputs
+        
+        @self.dash_app.callback(
+            [
+                Output('timeseries-chart', 'figure'),
+                Output('timeseries-state', 'data')
+            ],
+            [Input('data-seq', 'data')],
+            [State('timeseries-state', 'data')]
+        )
+        def update_timeseries(seq, rendered):
+            frame_seq, df, _ = self._current_frame()
+            if rendered and rendered['seq'] == frame_seq:
+                return dash.no_update, dash.no_update
+            
+            # Append to the browser's copy of the chart when only a few rows are new
+            if rendered:
+                patched = self._patch_timeseries(rendered, frame_seq, df)
+                if patched is not None:
+                    return patched
+            
+            cached_seq, fig, state = self.timeseries_cache
+            if cached_seq != frame_seq:
+                if df.empty:
+                    fig, state = self._empty_figure(), None
+                else:
+                    fig, state = self._create_timeseries_chart(df.copy(), frame_seq)
+                self.timeseries_cache = (frame_seq, fig, state)
+            return fig, state
+    
+    @staticmethod
+    def _empty_figure():
+        """Placeholder figure shown while there is no data"""
+        empty_fig = go.Figure().add_annotation(
+            text="No data available",
+            xref="paper", yref="paper",
+            x=0.5, y=0.5, showarrow=False
+        )
+        empty_fig.update_layout(template="plotly_dark", height=400)
+        return empty_fig
     
     def _allowed_file(self, filename):
         """Check if file extension is allowed"""
         return '.' in filename and filename.rsplit('.', 1)[1].lower() in self.allowed_extensions
     
-    def _process_file(self, filepath):
-        """Process uploaded file"""
+    def _save_upload(self, stream, filename):
+        """Write an upload to a content-addressed path, hashing it in the same pass.
+        
+        Identical uploads share one file on disk, named by digest and extension.
+        """
+        file_ext = os.path.splitext(filename)[1].lower()
+        hasher = hashlib.blake2b(digest_size=16)
+        part_path = os.path.join(self.upload_folder, f'.{uuid.uuid4().hex}.part')
+        
+        with open(part_path, 'wb') as dst:
+            while True:
+                chunk = stream.read(1 << 20)
+                if not chunk:
+                    break
+                hasher.update(chunk)
+                dst.write(chunk)
+        
+        digest = hasher.hexdigest()
+        filepath = os.path.join(self.upload_folder, f'{digest}{file_ext}')
+        os.replace(part_path, filepath)
+        return filepath
+    
+    @staticmethod
+    def _new_parse_pool():
+        """Process pool for upload parsing; spawn avoids forking a process that is running threads"""
+        return ProcessPoolExecutor(
+            max_workers=min(4, os.cpu_count() or 1),
+            mp_context=multiprocessing.get_context('spawn')
+        )
+    
+    def _replace_parse_pool(self, broken):
+        """Swap out a pool whose worker died; concurrent callers share one replacement"""
+        with self.parse_pool_lock:
+            if self.parse_pool is broken:
+                broken.shutdown(wait=False)
+                self.parse_pool = self._new_parse_pool()
+                logger.warning("Upload parse pool was broken; started a new one")
+            return self.parse_pool
+    
+    def _start_parse(self, job_id, filename, filepath, content_key, retried=False):
+        """Submit an upload to the parse pool, replacing the pool if it is broken"""
+        with self.parse_pool_lock:
+            pool = self.parse_pool
         try:
-            file_ext = os.path.splitext(filepath)[1].lower()
-            
-            if file_ext == '.json':
-                with open(filepath, 'r') as f:
-                    data = json.load(f)
-                if isinstance(data, list):
-                    return data
-                else:
-                    return [data]
-            
-            elif file_ext == '.csv':
-                df = pd.read_csv(filepath)
-                return df.to_dict('records')
-            
-            else:
-                raise ValueError(f"Unsupported file type: {file_ext}")
-                
+            future = pool.submit(process_file, filepath, self.max_records)
+        except BrokenProcessPool:
+            pool = self._replace_parse_pool(pool)
+            future = pool.submit(process_file, filepath, self.max_records)
+        future.add_done_callback(
+            lambda f: self._finish_upload(job_id, filename, filepath, content_key, pool, f, retried)
+        )
+    
+    def _finish_upload(self, job_id, filename, filepath, content_key, pool, future, retried):
+        """Stream a parsed upload and tell clients the job has finished"""
+        try:
+            parsed = future.result()
+        except BrokenProcessPool as e:
+            # A worker died (e.g. OOM) and took the pool down: start a fresh
+            # pool and give the job one more try there
+            self._replace_parse_pool(pool)
+            if not retried:
+                try:
+                    self._start_parse(job_id, filename, filepath, content_key, retried=True)
+                    return
+                except Exception as retry_error:
+                    e = retry_error
+            self._fail_upload(job_id, filename, e)
+            return
         except Exception as e:
-            logger.error(f"Error processing file {filepath}: {str(e)}")
-            raise
+            self._fail_upload(job_id, filename, e)
+            return
+        
+        with self.parsed_cache_lock:
+            self.parsed_cache[content_key] = parsed
+            if len(self.parsed_cache) > self.parsed_cache_size:
+                self.parsed_cache.popitem(last=False)
+        
+        data, total_rows = parsed
+        self._add_data_to_stream(data)
+        self.upload_jobs.finish(job_id, records=total_rows)
+        # Done callbacks run on the pool's helper thread; emit from the server's
+        # own async mode instead
+        self.socketio.start_background_task(
+            self.socketio.emit, 'upload_done', {'job_id': job_id, 'filename': filename, 'records': total_rows}
+        )
+    
+    def _fail_upload(self, job_id, filename, error):
+        """Record a failed parse and tell clients about it"""
+        logger.error(f"Upload error: {str(error)}")
+        message = str(error) or type(error).__name__
+        self.upload_jobs.finish(job_id, error=error)
+        self.socketio.start_background_task(
+            self.socketio.emit, 'upload_failed', {'job_id': job_id, 'filename': filename, 'error': message}
+        )
+    
+    def _snapshot_payload(self):
+        """Full buffer plus the sequence number it is current as of"""
+        with self.data_lock:
+            return {
+                'data': list(self.current_data),
+                'seq': self.seq,
+                'total_records': len(self.current_data),
+                'timestamp': time.time()
+            }
+    
+    @staticmethod
+    def _downcast_numeric(df):
+        """Narrow int64 columns to int32 where every value fits.
+        
+        Halves the bytes behind those columns without changing any value. Floats
+        stay float64, since float32 would alter the numbers the charts plot.
+        """
+        narrowed = {}
+        for col in df.select_dtypes(include=['int64']).columns:
+            values = df[col].to_numpy()
+            if values.size == 0 or (values.min() >= -2 ** 31 and values.max() < 2 ** 31):
+                narrowed[col] = 'int32'
+        return df.astype(narrowed) if narrowed else df
+    
+    def _current_frame(self):
+        """Return (seq, DataFrame of current_data, category counts), rebuilt only when seq has moved"""
+        with self.data_lock:
+            seq = self.seq
+            cached_seq, frame, counts = self.frame_cache
+            if cached_seq == seq:
+                return seq, frame, counts
+            records = list(self.current_data)
+            counts = {field: Counter(values) for field, values in self.category_counts.items()}
+        
+        # Build outside the lock; a concurrent caller may build the same seq too
+        frame = self._downcast_numeric(pd.DataFrame.from_records(records))
+        with self.data_lock:
+            if self.frame_cache[0] < seq:
+                self.frame_cache = (seq, frame, counts)
+        return seq, frame, counts
+    
+    def _count_categories(self, records, delta):
+        """Add (delta=1) or remove (delta=-1) records' string values from category_counts"""
+        for record in records:
+            if not isinstance(record, dict):
+                continue
+            for field, value in record.items():
+                if not isinstance(value, str) or field in self.uncounted_fields:
+                    continue
+                counts = self.category_counts.get(field)
+                if counts is None:
+                    counts = self.category_counts[field] = Counter()
+                counts[value] += delta
+                if counts[value] <= 0:
+                    del counts[value]
+                elif len(counts) > MAX_CATEGORY_VALUES:
+                    # Near-unique field; stop counting it for good
+                    del self.category_counts[field]
+                    self.uncounted_fields.add(field)
     
     def _add_data_to_stream(self, new_data):
         """Add data to the stream and broadcast"""
+        if not isinstance(new_data, list):
+            new_data = [new_data]
+        if not new_data:
+            return
+        
         with self.data_lock:
-            if isinstance(new_data, list):
-                self.current_data.extend(new_data)
-            else:
-                self.current_data.append(new_data)
+            # The deque will evict this many of its oldest records
+            overflow = len(self.current_data) + len(new_data) - self.max_records
+            if overflow > 0:
+                self._count_categories(islice(self.current_data, overflow), -1)
+            self._count_categories(new_data[-self.max_records:], 1)
+            
+            self.current_data.extend(new_data)
+            self.seq += len(new_data)
+            self.updated_at = time.time()
             
-            # Keep only recent records
-            if len(self.current_data) > self.max_records:
-                self.current_data = self.current_data[-self.max_records:]
-        
-        # Broadcast to all clients
-        self.socketio.emit('new_data', {
-            'data': self.current_data,
-            'total_records': len(self.current_data),
+            self.pending_rows.extend(new_data)
+            if len(self.pending_rows) > self.max_records:
+                del self.pending_rows[:-self.max_records]
+            if self.flush_scheduled:
+                return
+            self.flush_scheduled = True
+        
+        # Appends within the window are broadcast together
+        self.socketio.start_background_task(self._flush_pending)
+    
+    def _flush_pending(self):
+        """Broadcast the rows appended during the last flush window as one delta"""
+        self.socketio.sleep(self.flush_interval_ms / 1000)
+        
+        with self.data_lock:
+            rows, self.pending_rows = self.pending_rows, []
+            self.flush_scheduled = False
+            seq = self.seq
+            total = len(self.current_data)
+        
+        # Broadcast only the appended rows; seq is the count after applying them
+        self.socketio.emit('data_delta', {
+            'appended': rows,
+            'seq': seq,
+            'total_records': total,
             'timestamp': time.time()
         })
     
     def _generate_sample_data(self, num_records=50):
         """Generate sample data for demonstration"""
-        np.random.seed(42)
+        # Private generator: same seeded output every call, without touching global state
+        rng = np.random.default_rng(42)
         
         categories = ['Electronics', 'Clothing', 'Books', 'Home', 'Sports']
         regions = ['North', 'South', 'East', 'West']
         statuses = ['active', 'inactive', 'pending']
         
-        data = []
-        for i in range(num_records):
-            record = {
-                'id': i + 1,
-                'timestamp': (datetime.now().timestamp() - (num_records - i) * 3600),
-                'value': round(np.random.normal(100, 25), 2),
-                'category': np.random.choice(categories),
-                'region': np.random.choice(regions),
-                'status': np.random.choice(statuses),
-                'score': round(np.random.uniform(0, 100), 1),
-                'amount': round(np.random.exponential(200), 2)
-            }
-            data.append(record)
+        # One draw per column instead of one per record
+        columns = {
+            'id': np.arange(1, num_records + 1).tolist(),
+            'timestamp': (datetime.now().timestamp() - np.arange(num_records, 0, -1) * 3600).tolist(),
+            'value': rng.normal(100, 25, num_records).round(2).tolist(),
+            'category': [categories[i] for i in rng.integers(0, len(categories), num_records)],
+            'region': [regions[i] for i in rng.integers(0, len(regions), num_records)],
+            'status': [statuses[i] for i in rng.integers(0, len(statuses), num_records)],
+            'score': rng.uniform(0, 100, num_records).round(1).tolist(),
+            'amount': rng.exponential(200, num_records).round(2).tolist()
+        }
         
-        return data
+        names = list(columns)
+        return [dict(zip(names, row)) for row in zip(*columns.values())]
+    
+    @staticmethod
+    def _column_stats(series):
+        """Mean and max of a numeric column in plain NumPy reductions, ignoring NaN"""
+        values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return np.nan, np.nan
+        return values.mean(), values.max()
     
-    def _create_kpi_cards(self, df):
+    def _frame_schema(self, df):
+        """Numeric, categorical and time-like columns of a frame.
+        
+        Uploaded schemas rarely change, so the dtype scans run once per distinct
+        (column, dtype) signature instead of in every chart helper on every render.
+        """
+        signature = tuple(zip(df.columns, df.dtypes))
+        schema = self.schema_cache.get(signature)
+        if schema is None:
+            schema = {
+                'numeric': df.select_dtypes(include=[np.number]).columns,
+                'categorical': df.select_dtypes(include=['object']).columns,
+                'time': [col for col in df.columns if 'time' in col.lower() or 'date' in col.lower()]
+            }
+            if len(self.schema_cache) >= 16:
+                self.schema_cache.clear()
+            self.schema_cache[signature] = schema
+        return schema
+    
+    def _create_kpi_cards(self, df, category_counts):
         """Create KPI cards"""
         cards = []
         
@@ -407,15 +825,17 @@ class GenericDataDashboard:
         )
         
         # Numeric columns KPIs
-        numeric_cols = df.select_dtypes(include=[np.number]).columns
+        schema = self._frame_schema(df)
+        numeric_cols = schema['numeric']
         if len(numeric_cols) > 0:
             col = numeric_cols[0]
+            mean, _ = self._column_stats(df[col])
             cards.append(
                 dbc.Col([
                     dbc.Card([
                         dbc.CardBody([
                             html.H5(f"Avg {col.title()}"),
-                            html.H2(f"{df[col].mean():.2f}", className="text-success")
+                            html.H2(f"{mean:.2f}", className="text-success")
                         ])
                     ])
                 ], width=3)
@@ -423,19 +843,20 @@ class GenericDataDashboard:
         
         if len(numeric_cols) > 1:
             col = numeric_cols[1] if len(numeric_cols) > 1 else numeric_cols[0]
+            _, maximum = self._column_stats(df[col])
             cards.append(
                 dbc.Col([
                     dbc.Card([
                         dbc.CardBody([
                             html.H5(f"Max {col.title()}"),
-                            html.H2(f"{df[col].max():.2f}", className="text-info")
+                            html.H2(f"{maximum:.2f}", className="text-info")
                         ])
                     ])
                 ], width=3)
             )
         
         # Categorical column
-        categorical_cols = df.select_dtypes(include=['object']).columns
+        categorical_cols = schema['categorical']
         if len(categorical_cols) > 0:
             col = categorical_cols[0]
             cards.append(
@@ -443,7 +864,7 @@ class GenericDataDashboard:
                     dbc.Card([
                         dbc.CardBody([
                             html.H5(f"Unique {col.title()}"),
-                            html.H2(f"{df[col].nunique()}", className="text-warning")
+                            html.H2(f"{self._unique_count(df, col, category_counts)}", className="text-warning")
                         ])
                     ])
                 ], width=3)
@@ -451,10 +872,17 @@ class GenericDataDashboard:
         
         return cards[:4]
     
+    @staticmethod
+    def _unique_count(df, col, category_counts):
+        """Distinct values of a column, from the running counts when it has them"""
+        if col in category_counts:
+            return len(category_counts[col])
+        return df[col].nunique()
+    
     def _create_overview_chart(self, df):
         """Create overview chart"""
         try:
-            numeric_cols = df.select_dtypes(include=[np.number]).columns
+            numeric_cols = self._frame_schema(df)['numeric']
             if len(numeric_cols) > 0:
                 col = numeric_cols[0]
                 fig = px.line(df.head(50), y=col, title=f"{col.title()} Trend")
@@ -465,14 +893,18 @@ class GenericDataDashboard:
         
         return go.Figure().update_layout(template="plotly_dark", height=400)
     
-    def _create_distribution_chart(self, df):
+    def _create_distribution_chart(self, df, category_counts):
         """Create distribution chart"""
         try:
-            categorical_cols = df.select_dtypes(include=['object']).columns
+            categorical_cols = self._frame_schema(df)['categorical']
             if len(categorical_cols) > 0:
                 col = categorical_cols[0]
-                value_counts = df[col].value_counts()
-                fig = px.pie(values=value_counts.values, names=value_counts.index, 
+                if col in category_counts:
+                    names, values = zip(*category_counts[col].most_common())
+                else:
+                    value_counts = df[col].value_counts()
+                    names, values = value_counts.index, value_counts.values
+                fig = px.pie(values=values, names=names, 
                            title=f"Distribution of {col.title()}")
                 fig.update_layout(template="plotly_dark", height=400)
                 return fig
@@ -481,35 +913,116 @@ class GenericDataDashboard:
         
         return go.Figure().update_layout(template="plotly_dark", height=400)
     
-    def _create_timeseries_chart(self, df):
-        """Create time series chart"""
+    def _convert_time_column(self, df):
+        """Convert the first time-like column to datetimes in place.
+        
+        Returns (time_col, value_col) for the time series, or None.
+        """
         try:
-            # Look for timestamp column
-            timestamp_cols = [col for col in df.columns if 'time' in col.lower() or 'date' in col.lower()]
-            numeric_cols = df.select_dtypes(include=[np.number]).columns
+            schema = self._frame_schema(df)
+            timestamp_cols = schema['time']
+            numeric_cols = schema['numeric']
             
             if timestamp_cols and len(numeric_cols) > 0:
                 time_col = timestamp_cols[0]
                 value_col = numeric_cols[0]
+                df[time_col] = self._to_datetime(df[time_col])
+                return time_col, value_col
+        except Exception:
+            pass
+        return None
+    
+    @staticmethod
+    def _to_datetime(values):
+        """Parse a time column; numeric values are epoch seconds"""
+        if pd.api.types.is_numeric_dtype(values):
+            return pd.to_datetime(values, unit='s')
+        return pd.to_datetime(values)
+    
+    def _create_timeseries_chart(self, df, seq):
+        """Create time series chart.
+        
+        Returns (figure, state). The state describes what the browser will hold, so
+        the next update can extend the trace instead of resending it; it is None
+        when the chart cannot be extended in place.
+        """
+        try:
+            columns = self._convert_time_column(df)
+            if columns is not None:
+                time_col, value_col = columns
                 
-                # Convert timestamp if needed
-                if pd.api.types.is_numeric_dtype(df[time_col]):
-                    df[time_col] = pd.to_datetime(df[time_col], unit='s')
-                else:
-                    df[time_col] = pd.to_datetime(df[time_col])
+                # WebGL line over the M4 subset, in time order
+                series = df[[time_col, value_col]].dropna()
+                in_order = series[time_col].is_monotonic_increasing
+                if not in_order:
+                    series = series.sort_values(time_col)
+                x = series[time_col].to_numpy()
+                y = series[value_col].to_numpy()
+                keep = m4_downsample(x, y)
                 
-                fig = px.line(df, x=time_col, y=value_col, title="Time Series Analysis")
-                fig.update_layout(template="plotly_dark", height=400)
-                return fig
+                fig = go.Figure(go.Scattergl(x=x[keep], y=y[keep].tolist(), mode='lines'))
+                fig.update_layout(
+                    title="Time Series Analysis", xaxis_title=time_col, yaxis_title=value_col,
+                    template="plotly_dark", height=400, uirevision=value_col
+                )
+                
+                # Extendable only while plotted points map one-to-one onto buffer rows
+                state = None
+                if in_order and len(series) == len(df) and len(keep) == len(x) and x.dtype.kind == 'M' and len(x):
+                    state = {
+                        'seq': seq, 'time_col': time_col, 'value_col': value_col,
+                        'rows': len(df), 'last': int(x[-1].view('i8'))
+                    }
+                return fig, state
         except Exception:
             pass
         
-        return go.Figure().update_layout(template="plotly_dark", height=400)
+        return go.Figure().update_layout(template="plotly_dark", height=400), None
+    
+    def _patch_timeseries(self, rendered, seq, df):
+        """Patch that appends new rows to the browser's time series and drops evicted ones.
+        
+        Returns (patch, state), or None when the chart has to be rebuilt instead.
+        """
+        added = seq - rendered['seq']
+        evicted = rendered['rows'] + added - len(df)
+        if not 0 < added <= min(len(df), MAX_PATCH_ROWS) or not 0 <= evicted <= MAX_PATCH_ROWS:
+            return None
+        if len(df) > 4 * CHART_BUCKETS:
+            return None
+        
+        time_col, value_col = rendered['time_col'], rendered['value_col']
+        schema = self._frame_schema(df)
+        if schema['time'][:1] != [time_col] or list(schema['numeric'][:1]) != [value_col]:
+            return None
+        
+        new_rows = df[[time_col, value_col]].tail(added)
+        if new_rows.isna().any().any():
+            return None
+        try:
+            x = self._to_datetime(new_rows[time_col]).to_numpy()
+        except Exception:
+            return None
+        if x.dtype.kind != 'M':
+            return None
+        ticks = x.view('i8')
+        if ticks[0] < rendered['last'] or (np.diff(ticks) < 0).any():
+            return None
+        
+        patch = Patch()
+        for _ in range(evicted):
+            del patch['data'][0]['x'][0]
+            del patch['data'][0]['y'][0]
+        patch['data'][0]['x'].extend(np.datetime_as_string(x, unit='ns').tolist())
+        patch['data'][0]['y'].extend(new_rows[value_col].tolist())
+        
+        state = dict(rendered, seq=seq, rows=len(df), last=int(ticks[-1]))
+        return patch, state
     
     def _create_correlation_chart(self, df):
         """Create correlation heatmap"""
         try:
-            numeric_cols = df.select_dtypes(include=[np.number]).columns
+            numeric_cols = self._frame_schema(df)['numeric']
             if len(numeric_cols) >= 2:
                 corr_matrix = df[numeric_cols].corr()
                 fig = px.imshow(corr_matrix, text_auto=True, title="Correlation Matrix")
@@ -523,11 +1036,16 @@ class GenericDataDashboard:
     def _create_scatter_chart(self, df):
         """Create scatter plot"""
         try:
-            numeric_cols = df.select_dtypes(include=[np.number]).columns
+            numeric_cols = self._frame_schema(df)['numeric']
             if len(numeric_cols) >= 2:
-                fig = px.scatter(df, x=numeric_cols[0], y=numeric_cols[1], 
-                               title=f"{numeric_cols[0]} vs {numeric_cols[1]}")
-                fig.update_layout(template="plotly_dark", height=400)
+                x_col, y_col = numeric_cols[0], numeric_cols[1]
+                fig = go.Figure(go.Scattergl(
+                    x=df[x_col].to_numpy(), y=df[y_col].to_numpy(), mode='markers'
+                ))
+                fig.update_layout(
+                    title=f"{x_col} vs {y_col}", xaxis_title=x_col, yaxis_title=y_col,
+                    template="plotly_dark", height=400, uirevision=f"{x_col}/{y_col}"
+                )
                 return fig
         except Exception:
             pass
@@ -542,22 +1060,23 @@ class GenericDataDashboard:
             if recent_data.empty:
                 return html.P("No data available")
             
-            # Create table
-            table_header = [html.Thead([html.Tr([html.Th(col) for col in recent_data.columns])])]
-            table_rows = []
+            # Cells are shown as text; CSS truncates long values instead of slicing each one
+            recent_data = recent_data.astype(str)
+            recent_data.columns = [str(col) for col in recent_data.columns]
             
-            for _, row in recent_data.iterrows():
-                table_rows.append(html.Tr([html.Td(str(val)[:50]) for val in row]))
-            
-            table_body = [html.Tbody(table_rows)]
-            
-            return dbc.Table(
-                table_header + table_body,
-                bordered=True,
-                dark=True,
-                hover=True,
-                responsive=True,
-                striped=True
+            return dash_table.DataTable(
+                data=recent_data.to_dict('records'),
+                columns=[{'name': col, 'id': col} for col in recent_data.columns],
+                style_table={'overflowX': 'auto'},
+                style_header={'backgroundColor': '#303030', 'color': 'white', 'fontWeight': 'bold'},
+                style_cell={
+                    'backgroundColor': '#222222',
+                    'color': 'white',
+                    'maxWidth': '50ch',
+                    'overflow': 'hidden',
+                    'textOverflow': 'ellipsis'
+                },
+                style_data_conditional=[{'if': {'row_index': 'odd'}, 'backgroundColor': '#2a2a2a'}]
             )
         except Exception:
             return html.P("Error displaying table")
@@ -573,10 +1092,30 @@ class GenericDataDashboard:
         
         self.socketio.run(self.app, host=host, port=port, debug=debug)
     
+    def _simulated_batch(self, size):
+        """Draw simulated metric fields for a batch of records.
+        
+        Categorical fields are drawn as small integer codes and decoded through
+        one label list per field, so every row shares the same label strings.
+        """
+        rng = self.simulation_rng
+        columns = {
+            'value': rng.normal(100, 25, size).round(2).tolist(),
+            **{
+                field: [labels[code] for code in rng.integers(0, len(labels), size, dtype=np.int8)]
+                for field, labels in SIMULATION_LABELS.items()
+            },
+            'score': rng.uniform(0, 100, size).round(1).tolist(),
+            'amount': rng.exponential(200, size).round(2).tolist()
+        }
+        
+        names = list(columns)
+        return [dict(zip(names, row)) for row in zip(*columns.values())]
+    
     def _start_simulation(self):
         """Start background data simulation"""
         def simulate_data():
-            time.sleep(3)  # Wait for server to start
+            self.socketio.sleep(3)  # Wait for server to start
             
             # Load initial sample data
             sample_data = self._generate_sample_data(20)
@@ -584,30 +1123,30 @@ class GenericDataDashboard:
             
             # Continuous simulation
             counter = 0
+            batch = []
             while True:
                 try:
+                    # Draw a batch of fields up front, release one record per tick
+                    if counter % SIMULATION_BATCH == 0:
+                        batch = self._simulated_batch(SIMULATION_BATCH)
+                    
                     # Generate new data point every 5 seconds
                     new_record = {
                         'id': 1000 + counter,
                         'timestamp': time.time(),
-                        'value': round(np.random.normal(100, 25), 2),
-                        'category': np.random.choice(['Electronics', 'Clothing', 'Books']),
-                        'region': np.random.choice(['North', 'South', 'East', 'West']),
-                        'status': np.random.choice(['active', 'inactive', 'pending']),
-                        'score': round(np.random.uniform(0, 100), 1),
-                        'amount': round(np.random.exponential(200), 2)
+                        **batch[counter % SIMULATION_BATCH]
                     }
                     
                     self._add_data_to_stream([new_record])
                     counter += 1
-                    time.sleep(5)
+                    self.socketio.sleep(5)
                     
                 except Exception as e:
                     logger.error(f"Simulation error: {str(e)}")
-                    time.sleep(10)
+                    self.socketio.sleep(10)
         
-        simulation_thread = threading.Thread(target=simulate_data, daemon=True)
-        simulation_thread.start()
+        # A daemon thread in threading mode, a greenlet under eventlet/gevent
+        self.socketio.start_background_task(simulate_data)
         logger.info("Background data simulation started")
 
 # Create HTML templates
@@ -678,13 +1217,45 @@ def create_templates():
                 });
         }
         
-        // WebSocket connection
+        // WebSocket connection: one snapshot on connect, then deltas
         const socket = io();
-        socket.on('new_data', function(data) {
+        let seq = -1;
+        
+        function showTotal(totalRecords) {
             document.getElementById('status').innerHTML = 
                 '<i class="fas fa-database me-2"></i>Data updated: ' + 
-                data.total_records + ' records';
+                totalRecords + ' records';
             document.getElementById('status').className = 'alert alert-success';
+        }
+        
+        socket.on('upload_done', function(data) {
+            document.getElementById('status').innerHTML = 
+                '<i class="fas fa-check me-2"></i>File ' + data.filename + ' processed: ' + 
+                data.records + ' records';
+            document.getElementById('status').className = 'alert alert-success';
+        });
+        
+        socket.on('upload_failed', function(data) {
+            document.getElementById('status').innerHTML = 
+                '<i class="fas fa-exclamation-triangle me-2"></i>Processing ' + data.filename + 
+                ' failed: ' + data.error;
+            document.getElementById('status').className = 'alert alert-danger';
+        });
+        
+        socket.on('snapshot', function(data) {
+            seq = data.seq;
+            showTotal(data.total_records);
+        });
+        
+        socket.on('data_delta', function(data) {
+            if (seq < 0 || data.seq - data.appended.length > seq) {
+                // Missed a delta; resync from a fresh snapshot
+                socket.emit('request_data');
+                return;
+            }
+            if (data.seq <= seq) return;
+            seq = data.seq;
+            showTotal(data.total_records);
         });
     </script>
 </body>
@@ -768,11 +1339,12 @@ def create_templates():
             .then(response => response.json())
             .then(data => {
                 const result = document.getElementById('result');
-                if (data.success) {
-                    result.innerHTML = '<div class="alert alert-success">' + data.message + '</div>';
-                    setTimeout(() => {
-                        window.location.href = '/dashboard/';
-                    }, 2000);
+                if (data.success && data.job_id) {
+                    // Parsed in the background; wait for the outcome before leaving
+                    result.innerHTML = '<div class="alert alert-info">' + data.message + '</div>';
+                    pollUpload(data.job_id);
+                } else if (data.success) {
+                    showUploaded(data.message);
                 } else {
                     result.innerHTML = '<div class="alert alert-danger">' + data.error + '</div>';
                 }
@@ -782,6 +1354,32 @@ def create_templates():
                     '<div class="alert alert-danger">Upload failed: ' + error + '</div>';
             });
         });
+        
+        function showUploaded(message) {
+            document.getElementById('result').innerHTML = '<div class="alert alert-success">' + message + '</div>';
+            setTimeout(() => {
+                window.location.href = '/dashboard/';
+            }, 2000);
+        }
+        
+        function pollUpload(jobId) {
+            fetch('/api/upload_status/' + jobId)
+                .then(response => response.json())
+                .then(data => {
+                    if (data.status === 'pending') {
+                        setTimeout(() => pollUpload(jobId), 500);
+                    } else if (data.success) {
+                        showUploaded(data.message + ' - ' + data.records + ' records loaded');
+                    } else {
+                        document.getElementById('result').innerHTML = 
+                            '<div class="alert alert-danger">Processing failed: ' + data.error + '</div>';
+                    }
+                })
+                .catch(error => {
+                    document.getElementById('result').innerHTML = 
+                        '<div class="alert alert-danger">Upload failed: ' + error + '</div>';
+                });
+        }
     </script>
 </body>
 </html>'''
@@ -0,0 +1,35 @@
+"""
+Gunicorn configuration for the enhanced dashboard (main:app)
+
+Usage: gunicorn -c gunicorn.conf.py main:app
+"""
+
+import os
+
+bind = f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', '5000')}"
+
+# Dashboard data lives in process memory, so a single worker keeps uploads,
+# polls and the simulator looking at the same stream. Concurrency comes from
+# threads: refresh polls, uploads and long-lived connections no longer queue
+# behind each other.
+#
+# Every open /api/stream holds a thread for as long as the browser tab stays
+# open. The app admits at most MAX_STREAMS of them (extra clients get a 503 and
+# poll instead), and the default thread count reserves that many on top of the
+# threads left for requests. Keep both settings in step when tuning either.
+workers = int(os.getenv('GUNICORN_WORKERS', '1'))
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'gthread')
+max_streams = int(os.getenv('MAX_STREAMS', '4'))
+threads = int(os.getenv('GUNICORN_THREADS', str(max(8, 2 * (os.cpu_count() or 1)) + max_streams)))
+# Only read by the eventlet/gevent worker classes; gthread ignores it
+worker_connections = 1000
+
+# Keep browser connections open between refresh polls
+keepalive = 5
+timeout = 120
+
+
+def post_worker_init(worker):
+    """Run the data simulator inside the worker that serves requests"""
+    from enhanced_dashboard import start_simulation
+    start_simulation()
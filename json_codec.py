@@ -0,0 +1,33 @@
+"""
+orjson encoding shared by the dashboards and the WebSocket server
+"""
+
+import orjson
+import pandas as pd
+
+# numpy scalars/arrays are encoded natively and NaN as null. Naive datetimes
+# are written without an offset, as isoformat() does; they are local times.
+JSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+def json_default(obj):
+    """orjson fallback for pandas date types, which it does not encode itself"""
+    if obj is pd.NaT:
+        return None
+    if hasattr(obj, 'isoformat'):
+        return obj.isoformat()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+def dumps_json(obj):
+    """Encode obj as JSON bytes"""
+    return orjson.dumps(obj, default=json_default, option=JSON_OPTIONS)
+
+class OrjsonCodec:
+    """json-module stand-in that lets python-socketio encode packets with orjson"""
+    
+    @staticmethod
+    def dumps(obj, *args, **kwargs):
+        return dumps_json(obj).decode()
+    
+    @staticmethod
+    def loads(s, *args, **kwargs):
+        return orjson.loads(s)
@@ -1,4 +1,7 @@
+import os
+
 from enhanced_dashboard import app
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000, debug=False)
+    # Run under the same Gunicorn setup as production
+    os.execvp('gunicorn', ['gunicorn', '-c', 'gunicorn.conf.py', 'main:app'])
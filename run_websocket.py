@@ -7,7 +7,20 @@ for real-time data streaming and file upload functionality.
 """
 
 import os
+
+# With SOCKETIO_ASYNC_MODE=gevent or eventlet, socketio.run serves on that
+# library's WSGI server; the stdlib has to be patched before app.py imports
+# threading, or blocking calls would stall every greenlet
+ASYNC_MODE = os.getenv('SOCKETIO_ASYNC_MODE', 'threading')
+if ASYNC_MODE == 'gevent':
+    from gevent import monkey
+    monkey.patch_all()
+elif ASYNC_MODE == 'eventlet':
+    import eventlet
+    eventlet.monkey_patch()
+
 import sys
+import importlib.util
 import logging
 import threading
 import time
@@ -101,13 +114,9 @@ def check_dependencies():
         'yaml', 'socketio', 'werkzeug'
     ]
     
-    missing_modules = []
-    
-    for module in required_modules:
-        try:
-            __import__(module)
-        except ImportError:
-            missing_modules.append(module)
+    # find_spec only locates each module; importing them here would run
+    # pandas' and plotly's start-up code just to answer yes or no
+    missing_modules = [module for module in required_modules if importlib.util.find_spec(module) is None]
     
     if missing_modules:
         print("ERROR: Missing required dependencies:")
@@ -5,33 +5,77 @@ Based on your Kafka WebSocket Server and Dash Client examples
 """
 
 import os
-import json
+
+# SOCKETIO_ASYNC_MODE=gevent serves each request on a greenlet; the stdlib has
+# to be patched before anything below imports threading or socket
+ASYNC_MODE = os.environ.get('SOCKETIO_ASYNC_MODE', 'threading')
+if ASYNC_MODE == 'gevent':
+    from gevent import monkey
+    monkey.patch_all()
+
+import hashlib
+import mmap
 import time
+import queue
 import threading
+import uuid
+from collections import deque
+import orjson
 import pandas as pd
 import numpy as np
 from datetime import datetime
-from flask import Flask, render_template, request, jsonify, send_from_directory
+from flask import Flask, Response, render_template, request, jsonify, send_from_directory
 from werkzeug.utils import secure_filename
+from json_codec import dumps_json
+from upload_io import UploadJobs, fadvise, save_upload_stream
 
 # Create Flask app
 app = Flask(__name__)
 app.secret_key = "generic-dashboard-secret-key"
 
-# Global data storage
-current_data = []
+# Global data storage; the deque drops the oldest records past 1000
+current_data = deque(maxlen=1000)
 data_lock = threading.Lock()
+# Bumped on every write; /api/data serializes once per value
+data_seq = 0
+data_updated_at = time.time()
+payload_cache = (-1, b'')
+
+# Uploads are saved by the request and parsed by a single worker thread
+upload_queue = queue.Queue()
+upload_jobs = UploadJobs()
+upload_worker = None
+worker_lock = threading.Lock()
 
 # Configuration
 UPLOAD_FOLDER = 'uploads'
-ALLOWED_EXTENSIONS = {'txt', 'pdf', 'png', 'jpg', 'jpeg', 'gif', 'json', 'csv'}
+ALLOWED_EXTENSIONS = frozenset({'.txt', '.pdf', '.png', '.jpg', '.jpeg', '.gif', '.json', '.jsonl', '.csv'})
+CSV_CHUNK_ROWS = 50000
+
+# Background simulator: one record per tick, drawn in vectorized batches
+SIMULATION_BATCH = 64
+SIMULATION_LABELS = {
+    'category': ['Electronics', 'Clothing', 'Books'],
+    'region': ['North', 'South', 'East', 'West'],
+    'status': ['active', 'inactive', 'pending']
+}
+
+# One PCG64 generator per thread: no reseeding per call and no shared state
+# between request threads and the simulator
+rng_local = threading.local()
 
 # Ensure upload directory exists
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 os.makedirs('templates', exist_ok=True)
 
 def allowed_file(filename):
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
+    return os.path.splitext(filename)[1].lower() in ALLOWED_EXTENSIONS
+
+def thread_rng():
+    rng = getattr(rng_local, 'rng', None)
+    if rng is None:
+        rng = rng_local.rng = np.random.default_rng()
+    return rng
 
 def create_sample_data():
     """Generate sample data similar to your examples"""
@@ -39,53 +83,115 @@ def create_sample_data():
     regions = ['North', 'South', 'East', 'West']
     statuses = ['active', 'inactive', 'pending']
     
-    data = []
-    for i in range(50):
-        record = {
-            'id': i + 1,
-            'timestamp': datetime.now().isoformat(),
-            'value': round(np.random.normal(100, 25), 2),
-            'category': np.random.choice(categories),
-            'region': np.random.choice(regions),
-            'status': np.random.choice(statuses),
-            'score': round(np.random.uniform(0, 100), 1),
-            'amount': round(np.random.exponential(200), 2),
-            'KPI': np.random.choice(['TUMBLE_COUNT_DISTINCT_CLAIMANT', 'HIGH_RISK_CLAIM_COUNT', 'SUM_TOTAL_CLM_AMT_PAID']),
-            'window_start': datetime.now().isoformat()
-        }
-        data.append(record)
+    kpis = ['TUMBLE_COUNT_DISTINCT_CLAIMANT', 'HIGH_RISK_CLAIM_COUNT', 'SUM_TOTAL_CLM_AMT_PAID']
+    num_records = 50
+    rng = thread_rng()
+    now = datetime.now().isoformat()
     
-    return data
+    # One draw per column instead of one per field of every record
+    columns = {
+        'id': range(1, num_records + 1),
+        'timestamp': [now] * num_records,
+        'value': rng.normal(100, 25, num_records).round(2).tolist(),
+        'category': [categories[i] for i in rng.integers(0, len(categories), num_records)],
+        'region': [regions[i] for i in rng.integers(0, len(regions), num_records)],
+        'status': [statuses[i] for i in rng.integers(0, len(statuses), num_records)],
+        'score': rng.uniform(0, 100, num_records).round(1).tolist(),
+        'amount': rng.exponential(200, num_records).round(2).tolist(),
+        'KPI': [kpis[i] for i in rng.integers(0, len(kpis), num_records)],
+        'window_start': [now] * num_records
+    }
+    
+    names = list(columns)
+    return [dict(zip(names, row)) for row in zip(*columns.values())]
 
 def add_data_to_stream(new_data):
     """Add data to global stream"""
-    global current_data
+    global data_seq, data_updated_at
     with data_lock:
         if isinstance(new_data, list):
             current_data.extend(new_data)
         else:
             current_data.append(new_data)
-        
-        # Keep only last 1000 records
-        if len(current_data) > 1000:
-            current_data = current_data[-1000:]
+        data_seq += 1
+        data_updated_at = time.time()
+
+def first_line_is_object(buf):
+    """Whether the first non-blank line of a buffer is one complete JSON object"""
+    start = 0
+    while True:
+        end = buf.find(b'\n', start)
+        line = buf[start:] if end < 0 else buf[start:end]
+        if line.strip() or end < 0:
+            break
+        start = end + 1
+    try:
+        return isinstance(orjson.loads(line), dict)
+    except orjson.JSONDecodeError:
+        return False
+
+def read_json_lines(f, max_records):
+    """Parse a JSON Lines file into (newest max_records records, total records).
+    
+    Lines are decoded one at a time, so memory is bounded by the kept tail.
+    """
+    f.seek(0)
+    tail = deque(maxlen=max_records)
+    total_rows = 0
+    for line in f:
+        if line.strip():
+            tail.append(orjson.loads(line))
+            total_rows += 1
+    return list(tail), total_rows
 
 def process_file(filepath):
-    """Process uploaded JSON or CSV file"""
+    """Process uploaded JSON, JSON Lines or CSV file into (records to stream, total rows in the file).
+    
+    Only the newest current_data.maxlen rows survive in the stream, so only
+    those are turned into record dicts.
+    """
+    max_records = current_data.maxlen
     try:
         file_ext = os.path.splitext(filepath)[1].lower()
         
-        if file_ext == '.json':
-            with open(filepath, 'r') as f:
-                data = json.load(f)
-            if isinstance(data, list):
-                return data
-            else:
-                return [data]
+        if file_ext in ('.json', '.jsonl'):
+            with open(filepath, 'rb') as f:
+                fadvise(f.fileno(), 'POSIX_FADV_SEQUENTIAL')
+                if os.fstat(f.fileno()).st_size == 0:
+                    raise ValueError("Uploaded file is empty")
+                if file_ext == '.json':
+                    # orjson parses straight from the mapped page cache
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf, memoryview(buf) as view:
+                        try:
+                            data = orjson.loads(view)
+                        except orjson.JSONDecodeError:
+                            # Several top-level objects are read as JSON Lines, but
+                            # only if the first line is a complete object on its
+                            # own; otherwise the document's own error stands
+                            if not first_line_is_object(buf):
+                                raise
+                        else:
+                            if not isinstance(data, list):
+                                data = [data]
+                            return data[-max_records:], len(data)
+                
+                return read_json_lines(f, max_records)
         
         elif file_ext == '.csv':
-            df = pd.read_csv(filepath)
-            return df.to_dict('records')
+            # Read in chunks so peak memory is one chunk plus the kept tail.
+            # The C engine also leaves ISO timestamps as strings, which is what
+            # the records were before and what the JSON encoders expect.
+            tail = None
+            total_rows = 0
+            with open(filepath, 'rb') as f:
+                fadvise(f.fileno(), 'POSIX_FADV_SEQUENTIAL')
+                for chunk in pd.read_csv(f, chunksize=CSV_CHUNK_ROWS):
+                    total_rows += len(chunk)
+                    tail = chunk if tail is None else pd.concat([tail, chunk])
+                    tail = tail.tail(max_records)
+            if tail is None:
+                return [], 0
+            return tail.to_dict('records'), total_rows
         
         else:
             raise ValueError(f"Unsupported file type: {file_ext}")
@@ -94,10 +200,30 @@ def process_file(filepath):
         print(f"Error processing file: {e}")
         raise
 
-@app.route('/')
-def index():
-    """Main dashboard page"""
-    return '''
+def process_uploads():
+    """Worker thread: parse queued uploads and add them to the stream"""
+    while True:
+        job_id, filepath = upload_queue.get()
+        try:
+            data, total_rows = process_file(filepath)
+            add_data_to_stream(data)
+            upload_jobs.finish(job_id, records=total_rows)
+        except Exception as e:
+            upload_jobs.finish(job_id, error=e)
+        upload_queue.task_done()
+
+def queue_upload(filename, filepath):
+    """Hand a saved upload to the worker thread and return its job id"""
+    global upload_worker
+    job_id = upload_jobs.add(filename)
+    with worker_lock:
+        if upload_worker is None:
+            upload_worker = threading.Thread(target=process_uploads, daemon=True)
+            upload_worker.start()
+    upload_queue.put((job_id, filepath))
+    return job_id
+
+INDEX_HTML = '''
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -205,7 +331,7 @@ def index():
                     <div class="card-body">
                         <form id="uploadForm" enctype="multipart/form-data">
                             <div class="mb-3">
-                                <input type="file" class="form-control" id="fileInput" accept=".json,.csv" required>
+                                <input type="file" class="form-control" id="fileInput" accept=".json,.jsonl,.csv" required>
                             </div>
                             <button type="submit" class="btn btn-primary">
                                 <i class="fas fa-upload me-2"></i>Upload
@@ -335,9 +461,9 @@ def index():
             .then(response => response.json())
             .then(data => {
                 if (data.success) {
-                    updateStatus('success', data.message);
+                    updateStatus('info', data.message);
                     hideUpload();
-                    refreshData();
+                    pollUpload(data.job_id);
                 } else {
                     updateStatus('danger', 'Upload failed: ' + data.error);
                 }
@@ -347,12 +473,41 @@ def index():
             });
         });
 
+        function pollUpload(jobId) {
+            fetch(`/api/upload_status/${jobId}`)
+                .then(response => response.json())
+                .then(data => {
+                    if (data.status === 'pending') {
+                        setTimeout(() => pollUpload(jobId), 500);
+                    } else if (data.success) {
+                        updateStatus('success', `${data.message} - ${data.records} records loaded`);
+                        refreshData();
+                    } else {
+                        updateStatus('danger', 'Processing failed: ' + data.error);
+                    }
+                })
+                .catch(error => {
+                    updateStatus('danger', 'Upload error: ' + error);
+                });
+        }
+
         // Auto-refresh every 30 seconds
         setInterval(refreshData, 30000);
     </script>
 </body>
 </html>
-    '''
+'''
+
+# The page never changes at runtime, so it is encoded and tagged once at import
+INDEX_HTML_BYTES = INDEX_HTML.encode('utf-8')
+INDEX_ETAG = hashlib.blake2b(INDEX_HTML_BYTES, digest_size=12).hexdigest()
+
+@app.route('/')
+def index():
+    """Main dashboard page"""
+    response = Response(INDEX_HTML_BYTES, mimetype='text/html')
+    response.set_etag(INDEX_ETAG)
+    return response.make_conditional(request)
 
 @app.route('/api/sample')
 def load_sample():
@@ -371,12 +526,30 @@ def load_sample():
 @app.route('/api/data')
 def get_data():
     """Get current data"""
+    global payload_cache
+    # Serialize once per write; polls in between reuse the same bytes. The
+    # lock only covers copying the record references, never the encode.
     with data_lock:
-        return jsonify({
-            'data': current_data,
-            'total_records': len(current_data),
-            'timestamp': time.time()
+        seq = data_seq
+        cached_seq, body = payload_cache
+        if cached_seq != seq:
+            records = list(current_data)
+            updated_at = data_updated_at
+    
+    if cached_seq != seq:
+        body = dumps_json({
+            'data': records,
+            'total_records': len(records),
+            'timestamp': updated_at
         })
+        with data_lock:
+            if payload_cache[0] < seq:
+                payload_cache = (seq, body)
+    
+    response = Response(body, mimetype='application/json')
+    response.set_etag(str(seq), weak=True)
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
 
 @app.route('/upload', methods=['POST'])
 def upload_file():
@@ -391,43 +564,65 @@ def upload_file():
         
         if file and file.filename and allowed_file(file.filename):
             filename = secure_filename(str(file.filename))
-            filepath = os.path.join(UPLOAD_FOLDER, filename)
-            file.save(filepath)
-            
-            # Process the file
-            data = process_file(filepath)
-            add_data_to_stream(data)
+            # A unique name per upload, so same-name uploads never overwrite a
+            # file the worker has yet to parse
+            filepath = os.path.join(UPLOAD_FOLDER, f'{uuid.uuid4().hex}_{filename}')
+            save_upload_stream(file.stream, filepath)
             
+            # Parsing happens on the upload worker; the client polls for the result
             return jsonify({
                 'success': True,
-                'message': f'File {filename} uploaded successfully',
-                'records': len(data)
-            })
+                'message': f'File {filename} uploaded, processing...',
+                'job_id': queue_upload(filename, filepath)
+            }), 202
         else:
             return jsonify({'success': False, 'error': 'Invalid file type'}), 400
             
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)}), 500
 
+@app.route('/api/upload_status/<job_id>')
+def upload_status(job_id):
+    """Report progress of a queued upload"""
+    payload, status = upload_jobs.status(job_id)
+    return jsonify(payload), status
+
+def generate_simulated_batch():
+    """Draw the random fields for SIMULATION_BATCH simulated records in one go"""
+    rng = thread_rng()
+    columns = {
+        'value': rng.normal(100, 25, SIMULATION_BATCH).round(2).tolist(),
+        **{
+            field: [labels[i] for i in rng.integers(0, len(labels), SIMULATION_BATCH)]
+            for field, labels in SIMULATION_LABELS.items()
+        },
+        'score': rng.uniform(0, 100, SIMULATION_BATCH).round(1).tolist(),
+        'amount': rng.exponential(200, SIMULATION_BATCH).round(2).tolist()
+    }
+    
+    names = list(columns)
+    return [dict(zip(names, row)) for row in zip(*columns.values())]
+
 def simulate_data():
     """Background thread to simulate real-time data like your Kafka example"""
     time.sleep(5)  # Wait for server to start
     
     counter = 0
+    batch = []
     while True:
         try:
+            # Draw a batch of fields up front, release one record per tick
+            if counter % SIMULATION_BATCH == 0:
+                batch = generate_simulated_batch()
+            
             # Generate new data point similar to your examples
+            now = datetime.now().isoformat()
             new_record = {
                 'id': 1000 + counter,
-                'timestamp': datetime.now().isoformat(),
-                'value': round(np.random.normal(100, 25), 2),
-                'category': np.random.choice(['Electronics', 'Clothing', 'Books']),
-                'region': np.random.choice(['North', 'South', 'East', 'West']),
-                'status': np.random.choice(['active', 'inactive', 'pending']),
-                'score': round(np.random.uniform(0, 100), 1),
-                'amount': round(np.random.exponential(200), 2),
+                'timestamp': now,
+                **batch[counter % SIMULATION_BATCH],
                 'KPI': 'REAL_TIME_STREAM',
-                'window_start': datetime.now().isoformat()
+                'window_start': now
             }
             
             add_data_to_stream([new_record])
@@ -450,4 +645,8 @@ if __name__ == '__main__':
     simulation_thread.start()
     
     # Run the app
-    app.run(host='0.0.0.0', port=5000, debug=False)
\ No newline at end of file
+    if ASYNC_MODE == 'gevent':
+        from gevent.pywsgi import WSGIServer
+        WSGIServer(('0.0.0.0', 5000), app).serve_forever()
+    else:
+        app.run(host='0.0.0.0', port=5000, debug=False, threaded=True)
\ No newline at end of file
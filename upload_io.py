@@ -0,0 +1,100 @@
+"""
+Upload handling shared by the dashboards
+Copies request bodies to disk, hints the kernel about how they are read next,
+and tracks the background jobs that parse them
+"""
+
+import os
+import shutil
+import threading
+import time
+import uuid
+
+UPLOAD_COPY_BUFFER = 1 << 20
+# Finished upload jobs are kept this long for clients to poll their outcome
+UPLOAD_JOB_TTL = 600
+
+def fadvise(fd, advice_name):
+    """Pass an access-pattern hint to the kernel where posix_fadvise exists"""
+    advice = getattr(os, advice_name, None)
+    if advice is None or not hasattr(os, 'posix_fadvise'):
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, advice)
+    except OSError:
+        pass
+
+def copy_to_fd(src, fd):
+    """Copy a file object to a raw descriptor, retrying short writes"""
+    while True:
+        block = src.read(UPLOAD_COPY_BUFFER)
+        if not block:
+            return
+        with memoryview(block) as view:
+            while view:
+                view = view[os.write(fd, view):]
+
+def save_upload_stream(stream, filepath):
+    """Copy an upload to disk and start prefetching it for the parser"""
+    # Buffered writes always complete; a raw file may accept only part of a block
+    with open(filepath, 'wb') as dst:
+        fadvise(dst.fileno(), 'POSIX_FADV_SEQUENTIAL')
+        shutil.copyfileobj(stream, dst, length=UPLOAD_COPY_BUFFER)
+        dst.flush()
+        fadvise(dst.fileno(), 'POSIX_FADV_WILLNEED')
+
+class UploadJobs:
+    """Registry of background upload parses that clients poll by job id.
+    
+    A finished job is reported once and then forgotten; finished jobs nobody
+    polls for are dropped when the next job is added.
+    """
+    
+    def __init__(self, ttl=UPLOAD_JOB_TTL):
+        self.ttl = ttl
+        self.jobs = {}
+        self.lock = threading.Lock()
+    
+    def add(self, filename):
+        """Record a pending parse and return its job id"""
+        job_id = uuid.uuid4().hex
+        now = time.monotonic()
+        with self.lock:
+            expired = [
+                key for key, job in self.jobs.items()
+                if job['status'] != 'pending' and now - job['finished_at'] > self.ttl
+            ]
+            for key in expired:
+                del self.jobs[key]
+            self.jobs[job_id] = {'status': 'pending', 'filename': filename}
+        return job_id
+    
+    def finish(self, job_id, records=None, error=None):
+        """Record how many records a job produced, or the error that stopped it"""
+        if error is None:
+            outcome = {'status': 'done', 'records': records}
+        else:
+            outcome = {'status': 'error', 'error': str(error) or type(error).__name__}
+        with self.lock:
+            if job_id in self.jobs:
+                self.jobs[job_id].update(outcome, finished_at=time.monotonic())
+    
+    def status(self, job_id):
+        """Return (payload, HTTP status) describing a job for its status endpoint"""
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return {'success': False, 'status': 'error', 'error': 'Unknown upload job'}, 404
+            if job['status'] == 'pending':
+                return {'success': True, 'status': 'pending'}, 200
+            del self.jobs[job_id]
+        
+        if job['status'] == 'error':
+            return {'success': False, 'status': 'error', 'error': job['error']}, 200
+        
+        return {
+            'success': True,
+            'status': 'done',
+            'message': f"File {job['filename']} uploaded successfully",
+            'records': job['records']
+        }, 200
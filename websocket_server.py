@@ -1,30 +1,86 @@
 import os
+
+# Run as a script with SOCKETIO_ASYNC_MODE=gevent or eventlet, the stdlib has
+# to be patched before the imports below (run_websocket.py does the same)
+if __name__ == '__main__':
+    if os.environ.get('SOCKETIO_ASYNC_MODE') == 'gevent':
+        from gevent import monkey
+        monkey.patch_all()
+    elif os.environ.get('SOCKETIO_ASYNC_MODE') == 'eventlet':
+        import eventlet
+        eventlet.monkey_patch()
+
 import json
 import logging
 import threading
 import time
-import pandas as pd
-from flask import Flask
+import zlib
+from collections import deque
+from dataclasses import dataclass
+from flask import Flask, request
 from flask_socketio import SocketIO
 from data_processor import DataProcessor
 from config import Config
+from json_codec import OrjsonCodec, dumps_json
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@dataclass(slots=True)
+class SimulatedRecord:
+    """One simulated data point; orjson encodes it like the equivalent dict"""
+    id: int
+    timestamp: float
+    value: int
+    category: str
+    status: str
+    metric_1: float
+    metric_2: float
+    region: str
+
+def to_columns(records):
+    """Reshape records into (column names, one value list per column).
+    
+    Columns are the union of the records' keys in first-seen order; a record
+    without a key contributes None to that column.
+    """
+    rows = [r if isinstance(r, dict) else {f: getattr(r, f) for f in r.__slots__} for r in records]
+    names = list(dict.fromkeys(key for row in rows for key in row))
+    return names, [[row.get(name) for row in rows] for name in names]
+
 class WebSocketServer:
     def __init__(self):
         """Initialize WebSocket server for real-time data streaming"""
         self.app = Flask(__name__)
         self.app.secret_key = os.environ.get("SESSION_SECRET", "websocket-secret-key")
-        self.socketio = SocketIO(self.app, cors_allowed_origins="*")
+        # Broadcasts are encoded once per emit and the same frame is written
+        # to every client, so a faster encoder pays off on each fanout
+        self.socketio = SocketIO(
+            self.app,
+            cors_allowed_origins="*",
+            async_mode=os.environ.get('SOCKETIO_ASYNC_MODE', 'threading'),
+            json=OrjsonCodec
+        )
         
         self.config = Config()
         self.data_processor = DataProcessor()
-        self.payload_list = []
+        # Keep only the last 1000 records; the deque evicts old ones itself
+        self.payload_list = deque(maxlen=1000)
+        # Sequence number of the newest record; clients use it to spot gaps
+        # in the delta stream and resync with request_data.
+        self.seq = 0
+        self.data_lock = threading.Lock()
         self.is_running = False
         
+        # Rows added since the last broadcast, flushed as one delta per window
+        self.emit_batch_ms = int(os.environ.get('EMIT_BATCH_MS', '100'))
+        self.pending_rows = []
+        self.flush_scheduled = False
+        
+        # zlib-compressed snapshot, rebuilt at most once per seq
+        self.snapshot_cache = (-1, b'')
+        
         self.setup_routes()
         
     def setup_routes(self):
@@ -39,74 +95,130 @@ class WebSocketServer:
             logger.info('Client disconnected from WebSocket server')
             
         @self.socketio.on('request_data')
-        def handle_data_request():
-            """Send current data to requesting client"""
-            if self.payload_list:
-                try:
-                    df = pd.DataFrame(self.payload_list)
-                    self.socketio.emit('new_data', {
-                        'data': df.to_dict('records'),
-                        'source': 'current_data'
-                    })
-                except Exception as e:
-                    logger.error(f"Error sending data to client: {str(e)}")
+        def handle_data_request(options=None):
+            """Send a full snapshot to the requesting client.
+            
+            Clients that pass {'compressed': True} get it as one zlib-compressed
+            JSON blob on 'snapshot_gz' instead of a 'new_data' event. An empty
+            window is still answered, so the client learns the current seq.
+            """
+            try:
+                if isinstance(options, dict) and options.get('compressed'):
+                    self.socketio.emit('snapshot_gz', self._compressed_snapshot(), to=request.sid)
+                    return
+                
+                # The records are already JSON-ready; no pandas round-trip
+                with self.data_lock:
+                    records = list(self.payload_list)
+                    seq = self.seq
+                self.socketio.emit('new_data', {
+                    'data': records,
+                    'source': 'current_data',
+                    'seq': seq
+                }, to=request.sid)
+            except Exception as e:
+                logger.error(f"Error sending data to client: {str(e)}")
+    
+    def _compressed_snapshot(self):
+        """The current window as zlib-compressed JSON, shared by all requests at one seq"""
+        with self.data_lock:
+            seq = self.seq
+            if self.snapshot_cache[0] == seq:
+                return self.snapshot_cache[1]
+            records = list(self.payload_list)
+        
+        # Level 1 already shrinks repetitive record JSON several times over
+        blob = zlib.compress(dumps_json({
+            'data': records,
+            'source': 'current_data',
+            'seq': seq
+        }), 1)
+        self.snapshot_cache = (seq, blob)
+        return blob
     
     def add_data(self, data):
-        """Add new data and broadcast to all clients"""
+        """Add new data and broadcast only the new rows to all clients"""
         try:
             if isinstance(data, dict):
-                self.payload_list.append(data)
+                rows = [data]
             elif isinstance(data, list):
-                self.payload_list.extend(data)
+                rows = data
             else:
                 logger.warning(f"Unsupported data type: {type(data)}")
                 return
+            if not rows:
+                return
             
-            # Keep only last 1000 records to prevent memory issues
-            if len(self.payload_list) > 1000:
-                self.payload_list = self.payload_list[-1000:]
-            
-            # Create DataFrame and emit to clients
-            df = pd.DataFrame(self.payload_list)
-            self.socketio.emit('new_data', {
-                'data': df.to_dict('records'),
-                'source': 'real_time',
-                'timestamp': time.time()
-            })
+            with self.data_lock:
+                self.payload_list.extend(rows)
+                self.seq += len(rows)
+                self.pending_rows.extend(rows)
+                if len(self.pending_rows) > self.payload_list.maxlen:
+                    del self.pending_rows[:-self.payload_list.maxlen]
+                if self.flush_scheduled:
+                    return
+                self.flush_scheduled = True
             
-            logger.info(f"Broadcasted data update to clients. Total records: {len(self.payload_list)}")
+            # Rows added within the batch window go out in a single emit
+            self.socketio.start_background_task(self._flush_pending)
             
         except Exception as e:
             logger.error(f"Error adding and broadcasting data: {str(e)}")
     
+    def _flush_pending(self):
+        """Broadcast the rows added during the last batch window as one delta"""
+        self.socketio.sleep(self.emit_batch_ms / 1000)
+        
+        with self.data_lock:
+            rows, self.pending_rows = self.pending_rows, []
+            self.flush_scheduled = False
+            seq = self.seq
+            total = len(self.payload_list)
+        
+        # Clients keep their own copy of the window, so only the new rows
+        # go out, column-oriented so each key is sent once per delta; the
+        # full snapshot is sent on request_data.
+        columns, values = to_columns(rows)
+        self.socketio.emit('data_delta', {
+            'columns': columns,
+            'data': values,
+            'count': len(rows),
+            'seq': seq,
+            'total_records': total,
+            'source': 'real_time',
+            'timestamp': time.time()
+        })
+        
+        logger.debug(f"Broadcasted {len(rows)} new records to clients. Total records: {total}")
+    
     def simulate_data_stream(self):
         """Simulate real-time data streaming for demonstration"""
-        logger.info("Starting data simulation thread")
+        logger.info("Starting data simulation task")
         counter = 0
         
         while self.is_running:
             try:
                 # Generate sample data point
-                sample_data = {
-                    'id': counter,
-                    'timestamp': time.time(),
-                    'value': 100 + (counter % 50),
-                    'category': f'Category_{counter % 5}',
-                    'status': 'active' if counter % 2 == 0 else 'inactive',
-                    'metric_1': (counter * 1.5) % 100,
-                    'metric_2': (counter * 2.3) % 200,
-                    'region': ['North', 'South', 'East', 'West'][counter % 4]
-                }
+                sample_data = SimulatedRecord(
+                    id=counter,
+                    timestamp=time.time(),
+                    value=100 + (counter % 50),
+                    category=f'Category_{counter % 5}',
+                    status='active' if counter % 2 == 0 else 'inactive',
+                    metric_1=(counter * 1.5) % 100,
+                    metric_2=(counter * 2.3) % 200,
+                    region=['North', 'South', 'East', 'West'][counter % 4]
+                )
                 
-                self.add_data(sample_data)
+                self.add_data([sample_data])
                 counter += 1
                 
                 # Wait before next data point
-                time.sleep(self.config.get_simulation_interval())
+                self.socketio.sleep(self.config.get_simulation_interval())
                 
             except Exception as e:
                 logger.error(f"Error in data simulation: {str(e)}")
-                time.sleep(5)  # Wait before retrying
+                self.socketio.sleep(5)  # Wait before retrying
     
     def load_sample_data(self):
         """Load initial sample data"""
@@ -126,11 +238,12 @@ class WebSocketServer:
             logger.error(f"Error loading sample data: {str(e)}")
     
     def start_simulation(self):
-        """Start data simulation in background thread"""
+        """Start data simulation as a Socket.IO background task"""
         if not self.is_running:
             self.is_running = True
-            simulation_thread = threading.Thread(target=self.simulate_data_stream, daemon=True)
-            simulation_thread.start()
+            # Runs on the server's async mode (a greenlet under eventlet or
+            # gevent), so the sleep and emit yield instead of blocking a thread
+            self.socketio.start_background_task(self.simulate_data_stream)
             logger.info("Data simulation started")
     
     def stop_simulation(self):